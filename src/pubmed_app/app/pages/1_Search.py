@@ -31,6 +31,11 @@ with st.sidebar:
         placeholder="Search in title & abstract...",
         help="Full-text search in article titles and abstracts"
     )
+    sort_by_relevance = st.checkbox(
+        "Sort by relevance",
+        value=False,
+        help="Rank keyword matches by relevance instead of publication year. Relevance ordering pages with OFFSET, so deep pages get slower; year ordering pages in constant time."
+    )
     
     st.markdown("#### Publication Year")
     year_options = ["All"] + [str(y) for y in filter_options.get("years", [])]
@@ -61,7 +66,13 @@ with st.sidebar:
     mesh_options = ["All"] + filter_options.get("mesh_terms", [])
     selected_mesh = st.selectbox("MeSH Term", mesh_options)
     
-    limit = st.slider("Max results", 10, 200, 50)
+    topic_options = ["All"] + filter_options.get("topics", [])
+    selected_topic = "All"
+    if len(topic_options) > 1:
+        st.markdown("#### Topic")
+        selected_topic = st.selectbox("Topic", topic_options)
+    
+    limit = st.slider("Results per page", 10, 200, 50)
     
     search_clicked = st.button("Search", type="primary", use_container_width=True)    
 
@@ -72,6 +83,8 @@ search_params = {"limit": limit}
 
 if keyword:
     search_params["keyword"] = keyword
+    search_params["ranked"] = sort_by_relevance
+    search_params["snippets"] = True
 
 if selected_year != "All" and not use_year_range:
     search_params["year"] = int(selected_year)
@@ -89,7 +102,16 @@ if author:
 if selected_mesh != "All":
     search_params["mesh_term"] = selected_mesh
 
-articles = search_service.search_articles(**search_params)
+if selected_topic != "All":
+    search_params["topic"] = selected_topic
+
+search_key = repr(sorted(search_params.items()))
+if st.session_state.get("search_key") != search_key:
+    st.session_state["search_key"] = search_key
+    st.session_state["search_cursor"] = None
+
+page = search_service.search_page(**search_params, cursor=st.session_state["search_cursor"])
+articles = page.articles
 
 st.markdown("---")
 
@@ -147,6 +169,9 @@ else:
                     
                     st.caption(" | ".join(meta_parts))
                     
+                    if article.snippet:
+                        st.markdown(f"…{article.snippet}…")
+                    
                     if article.abstract:
                         preview = article.abstract[:300] + "..." if len(article.abstract) > 300 else article.abstract
                         with st.expander("Show abstract"):
@@ -192,4 +217,15 @@ else:
         pmid_input = st.text_input("Enter PMID", label_visibility="collapsed", placeholder="e.g., 12345678")
         if pmid_input:
             st.session_state["selected_pmid"] = pmid_input
-            st.switch_page("pages/2_Details.py")
\ No newline at end of file
+            st.switch_page("pages/2_Details.py")
+
+if page.previous_cursor or page.next_cursor:
+    prev_col, _, next_col = st.columns([1, 4, 1])
+    with prev_col:
+        if st.button("← Previous", disabled=not page.previous_cursor, use_container_width=True):
+            st.session_state["search_cursor"] = page.previous_cursor
+            st.rerun()
+    with next_col:
+        if st.button("Next →", disabled=not page.next_cursor, use_container_width=True):
+            st.session_state["search_cursor"] = page.next_cursor
+            st.rerun()
@@ -70,18 +70,245 @@ def init_db(
         console.print(f"[bold red]Error initializing database:[/bold red] {e}")
         raise typer.Exit(code=1)
 
+@db_app.command("migrate")
+def migrate_db():
+    from pubmed_app.config import settings, logger
+    from pubmed_app.database.connection import execute_single_query, run_schema
+
+    console.print(f"[bold green]Migrating database:[/bold green] {settings.DB_NAME}")
+
+    migration_path = Path(__file__).parent.parent / "database" / "migrate.sql"
+
+    try:
+        server_version = int(execute_single_query("SHOW server_version_num")["server_version_num"])
+        if server_version < 120000:
+            console.print("[bold red]PostgreSQL 12 or newer is required for the generated search_vector column.[/bold red]")
+            raise typer.Exit(code=1)
+
+        run_schema(schema_path=migration_path)
+        console.print("[bold green]Database migrated successfully.[/bold green]")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        logger.error(f"Error migrating database: {e}")
+        console.print(f"[bold red]Error migrating database:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+@db_app.command("bulk-load")
+def bulk_load(
+    directory: Optional[Path] = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        help="Directory containing PubMed baseline .xml.gz files."
+        ),
+    topic: Optional[str] = typer.Option(
+        None,
+        "--topic", "-t",
+        help="Load a PubMed search instead of local files."
+        ),
+    max_results: int = typer.Option(
+        100,
+        "--max-results", "-m",
+        help="Maximum number of articles to fetch for --topic."
+        ),
+    fetch_workers: int = typer.Option(
+        1,
+        "--fetch-workers",
+        help="Number of concurrent efetch requests for --topic."
+        ),
+    pattern: str = typer.Option(
+        "*.xml.gz",
+        "--pattern",
+        help="Glob pattern used to select files in the directory."
+        ),
+    workers: int = typer.Option(
+        1,
+        "--workers", "-w",
+        help="Number of files to process in parallel processes."
+        ),
+    concurrently: bool = typer.Option(
+        True,
+        "--concurrently/--no-concurrently",
+        help="Rebuild indexes with CREATE INDEX CONCURRENTLY so the tables stay writable."
+        ),
+    debug: bool = typer.Option(
+        False,
+        "--debug", "-d",
+        help="Enable debug logging."
+        )
+    ):
+    from pubmed_app.config import settings, logger
+    from pubmed_app.database.indexes import defer_indexes
+    if debug:
+        import logging
+        logging.getLogger('pubmed_app_logger').setLevel(logging.DEBUG)
+
+    if (directory is None) == (topic is None):
+        console.print("[bold red]Give either a directory or --topic.[/bold red]")
+        raise typer.Exit(code=1)
+
+    try:
+        console.print("[bold blue]Dropping secondary and full-text indexes...[/bold blue]")
+        deferred = defer_indexes()
+        console.print(f"[bold green]Deferred {len(deferred)} indexes.[/bold green]")
+
+        if directory is not None:
+            from pubmed_app.etl.file_ingest import FileIngestor
+            console.print(f"[bold blue]Bulk loading files from:[/bold blue] {directory}")
+            stats = FileIngestor(workers=workers, bulk_load=True).run(directory, pattern=pattern)
+        else:
+            from pubmed_app.etl.etl_pipeline import ETLPipeline
+            console.print(f"[bold blue]Bulk loading topic:[/bold blue] {topic}")
+            pipeline = ETLPipeline(email=settings.PUBMED_EMAIL, api_key=settings.PUBMED_API_KEY, bulk_load=True)
+            stats = pipeline.run(search_term=topic, retmax=max_results, fetch_workers=fetch_workers)
+        console.print(f"[bold green]Load completed with stats:[/bold green] {stats}")
+    except Exception as e:
+        logger.error(f"Error bulk loading: {e}")
+        console.print(f"[bold red]Error bulk loading:[/bold red] {e}")
+        console.print("[bold yellow]Indexes are still deferred. Run the load again or use 'db rebuild-indexes'.[/bold yellow]")
+        raise typer.Exit(code=1)
+
+    _rebuild_indexes(concurrently)
+
+@db_app.command("rebuild-indexes")
+def rebuild_deferred_indexes(
+    concurrently: bool = typer.Option(
+        True,
+        "--concurrently/--no-concurrently",
+        help="Rebuild indexes with CREATE INDEX CONCURRENTLY so the tables stay writable."
+        )
+    ):
+    _rebuild_indexes(concurrently)
+
+def _rebuild_indexes(concurrently: bool) -> None:
+    from pubmed_app.config import logger
+    from pubmed_app.database.indexes import rebuild_indexes, analyze_tables
+
+    def report(number: int, total: int, index_name: str) -> None:
+        console.print(f"[bold blue]Rebuilding index {number}/{total}:[/bold blue] {index_name}")
+
+    try:
+        rebuilt = rebuild_indexes(concurrently=concurrently, on_progress=report)
+        console.print(f"[bold green]Rebuilt {rebuilt} indexes.[/bold green]")
+
+        console.print("[bold blue]Analyzing tables...[/bold blue]")
+        analyze_tables()
+        console.print("[bold green]Indexes rebuilt and tables analyzed.[/bold green]")
+    except Exception as e:
+        logger.error(f"Error rebuilding indexes: {e}")
+        console.print(f"[bold red]Error rebuilding indexes:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
 @app.command()
 def etl(
-    topic: str = typer.Option(
-        ...,
+    topic: Optional[str] = typer.Option(
+        None,
         "--topic", "-t",
         help="The search term/topic to fetch articles from PubMed."
         ),
+    manifest: Optional[Path] = typer.Option(
+        None,
+        "--manifest",
+        exists=True,
+        dir_okay=False,
+        help="YAML file listing topics to search; overlapping articles are fetched once."
+        ),
     max_results: int =typer.Option(
         100,
         "--max-results", "-m",
         help="Maximum number of articles to fetch."
         ),
+    batch_size: int = typer.Option(
+        500,
+        "--batch-size", "-b",
+        help="Number of articles to fetch per efetch request."
+        ),
+    fetch_workers: int = typer.Option(
+        1,
+        "--fetch-workers", "-w",
+        help="Number of concurrent efetch requests (rate limited to the NCBI quota)."
+        ),
+    parse_workers: int = typer.Option(
+        1,
+        "--parse-workers", "-p",
+        help="Number of processes used to parse and transform fetched batches, in both normal and staged mode."
+        ),
+    unordered: bool = typer.Option(
+        False,
+        "--unordered",
+        help="Load parsed batches as soon as they finish instead of in fetch order."
+        ),
+    staged: bool = typer.Option(
+        False,
+        "--staged",
+        help="Run fetch, parse/transform and load as concurrent stages connected by bounded queues."
+        ),
+    load_workers: int = typer.Option(
+        1,
+        "--load-workers",
+        help="Number of loader threads in staged mode."
+        ),
+    queue_size: int = typer.Option(
+        4,
+        "--queue-size",
+        help="Maximum number of batches buffered between stages in staged mode."
+        ),
+    load_processes: int = typer.Option(
+        1,
+        "--load-processes",
+        help="Number of loader processes, each with its own connection; articles are partitioned by PMID."
+        ),
+    bulk: bool = typer.Option(
+        False,
+        "--bulk",
+        help="Load through COPY into staging tables and set-based merges."
+        ),
+    warm_cache: bool = typer.Option(
+        False,
+        "--warm-cache",
+        help="Preload journal and MeSH term IDs into the loader cache before loading."
+        ),
+    update: bool = typer.Option(
+        False,
+        "--update", "-u",
+        help="Rewrite existing articles whose content changed since they were loaded."
+        ),
+    skip_existing: bool = typer.Option(
+        False,
+        "--skip-existing",
+        help="Check search results against loaded PMIDs and only fetch missing articles."
+        ),
+    commit_size: int = typer.Option(
+        500,
+        "--commit-size",
+        help="Number of articles loaded per transaction."
+        ),
+    job: Optional[str] = typer.Option(
+        None,
+        "--job", "-j",
+        help="Record progress under this job name so an interrupted run can be resumed."
+        ),
+    resume: Optional[str] = typer.Option(
+        None,
+        "--resume",
+        help="Resume the named job from its last checkpoint."
+        ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental", "-i",
+        help="Only fetch articles added since the topic's last sync."
+        ),
+    cache: bool = typer.Option(
+        False,
+        "--cache", "-c",
+        help="Store raw efetch XML in the on-disk cache."
+        ),
+    replay: bool = typer.Option(
+        False,
+        "--replay", "-r",
+        help="Reload articles from the on-disk cache without contacting PubMed."
+        ),
     debug: bool = typer.Option(
         False,
         "--debug", "-d",
@@ -93,21 +320,120 @@ def etl(
     if debug:
         import logging
         logging.getLogger('pubmed_app_logger').setLevel(logging.DEBUG)
-    console.print(f"[bold green]Starting ETL pipeline for topic:[/bold green] {topic}")
-    console.print(f"[bold green]Maximum results to fetch:[/bold green] {max_results}")
+
+    if not topic and not replay and not resume and not manifest:
+        console.print("[bold red]--topic is required unless --replay, --resume or --manifest is given.[/bold red]")
+        raise typer.Exit(code=1)
+
+    if replay:
+        console.print(f"[bold green]Replaying cached batches from:[/bold green] {settings.ETL_CACHE_DIR}")
+    elif manifest:
+        console.print(f"[bold green]Starting ETL pipeline for manifest:[/bold green] {manifest}")
+    elif resume:
+        console.print(f"[bold green]Resuming ETL job:[/bold green] {resume}")
+    else:
+        console.print(f"[bold green]Starting ETL pipeline for topic:[/bold green] {topic}")
+        console.print(f"[bold green]Maximum results to fetch:[/bold green] {max_results}")
 
     try:
         pipeline = etl_pipeline.ETLPipeline(
             email=settings.PUBMED_EMAIL,
-            api_key=settings.PUBMED_API_KEY
+            api_key=settings.PUBMED_API_KEY,
+            cache_dir=settings.ETL_CACHE_DIR if cache or replay else None,
+            parse_workers=parse_workers,
+            ordered=not unordered,
+            staged=staged,
+            load_workers=load_workers,
+            queue_size=queue_size,
+            bulk_load=bulk,
+            warm_cache=warm_cache,
+            commit_size=commit_size,
+            update=update,
+            skip_existing=skip_existing,
+            load_processes=load_processes
         )
-        stats = pipeline.run(search_term=topic, retmax=max_results)
+        try:
+            if replay:
+                stats = pipeline.replay(topic=topic)
+            elif manifest:
+                from pubmed_app.etl.manifest import load_manifest
+                topics = load_manifest(manifest, default_max_results=max_results)
+                stats = pipeline.run_manifest(topics, batch_size=batch_size, fetch_workers=fetch_workers)
+            elif resume:
+                stats = pipeline.resume(job_name=resume, fetch_workers=fetch_workers)
+            else:
+                stats = pipeline.run(
+                    search_term=topic,
+                    retmax=max_results,
+                    batch_size=batch_size,
+                    fetch_workers=fetch_workers,
+                    incremental=incremental,
+                    job_name=job
+                )
+        finally:
+            pipeline.close()
         console.print(f"[bold green]ETL pipeline completed with stats:[/bold green] {stats}")
     except Exception as e:
         logger.error(f"Error running ETL pipeline: {e}")
         console.print(f"[bold red]Error running ETL pipeline:[/bold red] {e}")
         raise typer.Exit(code=1)
 
+@app.command("ingest-files")
+def ingest_files(
+    directory: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        help="Directory containing PubMed baseline/update .xml.gz files. Files in an 'updatefiles' directory are always applied in order with --update."
+        ),
+    pattern: str = typer.Option(
+        "*.xml.gz",
+        "--pattern",
+        help="Glob pattern used to select files in the directory."
+        ),
+    workers: int = typer.Option(
+        1,
+        "--workers", "-w",
+        help="Number of files to process in parallel processes."
+        ),
+    bulk: bool = typer.Option(
+        False,
+        "--bulk",
+        help="Load through COPY into staging tables and set-based merges."
+        ),
+    update: bool = typer.Option(
+        False,
+        "--update", "-u",
+        help="Rewrite existing articles whose content changed since they were loaded."
+        ),
+    no_resume: bool = typer.Option(
+        False,
+        "--no-resume",
+        help="Re-ingest files that were already recorded as completed."
+        ),
+    debug: bool = typer.Option(
+        False,
+        "--debug", "-d",
+        help="Enable debug logging."
+        )
+    ):
+    from pubmed_app.config import logger
+    from pubmed_app.etl.file_ingest import FileIngestor
+    if debug:
+        import logging
+        logging.getLogger('pubmed_app_logger').setLevel(logging.DEBUG)
+    console.print(f"[bold green]Ingesting files from:[/bold green] {directory}")
+    console.print(f"[bold green]Worker processes:[/bold green] {workers}")
+
+    try:
+        ingestor = FileIngestor(workers=workers, bulk_load=bulk, update=update)
+        stats = ingestor.run(directory, pattern=pattern, resume=not no_resume)
+        console.print(f"[bold green]File ingest completed with stats:[/bold green] {stats}")
+    except Exception as e:
+        logger.error(f"Error ingesting files: {e}")
+        console.print(f"[bold red]Error ingesting files:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
 @app.command()
 def serve(
     port: int = typer.Option(
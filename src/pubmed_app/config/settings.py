@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     BASE_URL: str
     LLM_MODEL_NAME: str
     API_KEY: str
+    ETL_CACHE_DIR: str = ".pubmed_cache"
 
     class Config:
         env_file = ".env"
@@ -7,7 +7,7 @@ from .connection import (
     db_manager
 )
 
-from .models import Article, Author, Journal, MeshTerm
+from .models import Article, ArticlePage, Author, Journal, MeshTerm
 from .curd import ArticleCRUD
 
 __all__ = [
@@ -18,6 +18,7 @@ __all__ = [
     "execute_write_query",
     "db_manager",
     "Article",
+    "ArticlePage",
     "Author",
     "Journal",
     "MeshTerm",
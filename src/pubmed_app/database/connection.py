@@ -1,5 +1,6 @@
 from pubmed_app.config import settings, logger
 
+import os
 import psycopg2
 from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor
@@ -10,6 +11,7 @@ from pathlib import Path
 class DatabaseManager:
     _instance: Optional["DatabaseManager"] = None
     _pool: Optional[ThreadedConnectionPool] = None
+    _pid: Optional[int] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -34,21 +36,32 @@ class DatabaseManager:
                 password=settings.DB_PASSWORD,
                 cursor_factory=RealDictCursor
             )
+            self._pid = os.getpid()
             logger.info(f"Database connection pool initialized successfully with {minconn}-{maxconn} connections.")
         except psycopg2.Error as e:
             logger.error(f"Error initializing database connection pool: {e}")
             raise
 
     def get_connection(self):
+        if self._pool is not None and self._pid != os.getpid():
+            self._discard_inherited_pool()
         if self._pool is None:
             self.initialize_pool()
         return self._pool.getconn()
     
     def return_connection(self, conn) -> None:
-        if self._pool is not None:
+        if self._pool is not None and self._pid == os.getpid():
             self._pool.putconn(conn)
 
+    def _discard_inherited_pool(self) -> None:
+        # Connections inherited through fork share sockets with the parent; closing them here would end the parent's sessions.
+        logger.info(f"Discarding connection pool inherited from process {self._pid}")
+        self._pool = None
+        self._pid = None
+
     def close_all_connections(self) -> None:
+        if self._pool is not None and self._pid != os.getpid():
+            self._discard_inherited_pool()
         if self._pool is not None:
             self._pool.closeall()
             self._pool = None
@@ -163,7 +176,7 @@ def  get_table_counts() -> dict[str, int]:
     return counts
 
 def verify_tables() -> dict[str, bool]:
-    excepted = ['articles', 'authors', 'journals', 'mesh_terms', 'article_authors', 'article_mesh_terms']
+    excepted = ['articles', 'authors', 'journals', 'mesh_terms', 'article_authors', 'article_mesh_terms', 'article_topics', 'etl_sync_state', 'ingested_files', 'etl_checkpoints', 'deferred_indexes']
 
     with get_raw_connection() as conn:
         with conn.cursor() as cur:
@@ -5,53 +5,66 @@ from pubmed_app.database.connection import (
     get_dict_cursor
 )
 
-from pubmed_app.database.models import Article, Author
+from pubmed_app.database.models import Article, ArticlePage, Author
 
+import base64
+import json
 from typing import Optional
 
 class ArticleCRUD:
-    def get_by_pmid(self, pmid: str) -> Article | None:
-        row = execute_single_query(
-            """
-            SELECT 
-                a.id, a.pmid, a.title, a.abstract, a.publication_year,
-                j.name AS journal_name
-            FROM articles a
-            LEFT JOIN journals j ON a.journal_id = j.id
-            WHERE a.pmid = %s
-            """,
-            (pmid,)
-        )
+    SORT_KEY = "COALESCE(a.publication_year, 0)"
 
-        if not row:
-            return None
-        
-        article = self._row_to_article(row)
-        article.authors = self._get_authors_for_article(row["id"])
-        article.mesh_terms = self._get_mesh_terms_for_article(row["id"])
-        return article
+    HYDRATED_ARTICLE_QUERY = """
+        SELECT
+            a.id, a.pmid, a.title, a.abstract, a.publication_year, a.created_at,
+            j.name AS journal_name,
+            COALESCE((
+                SELECT json_agg(
+                    json_build_object(
+                        'last_name', au.last_name,
+                        'first_name', au.first_name,
+                        'affiliation', au.affiliation
+                    )
+                    ORDER BY aa.author_postion
+                )
+                FROM article_authors aa
+                JOIN authors au ON au.id = aa.author_id
+                WHERE aa.article_id = a.id
+            ), '[]'::json) AS authors,
+            ARRAY(
+                SELECT mt.term
+                FROM article_mesh_terms amt
+                JOIN mesh_terms mt ON mt.id = amt.mesh_term_id
+                WHERE amt.article_id = a.id
+                ORDER BY mt.term ASC
+            ) AS mesh_terms
+        FROM articles a
+        LEFT JOIN journals j ON a.journal_id = j.id
+    """
+
+    def get_by_pmid(self, pmid: str) -> Article | None:
+        row = execute_single_query(self.HYDRATED_ARTICLE_QUERY + " WHERE a.pmid = %s", (pmid,))
+        return self._row_to_hydrated_article(row) if row else None
     
     def get_by_id(self, article_id: int) -> Optional[Article]:
-        row = execute_single_query(
-            """
-            SELECT 
-                a.id, a.pmid, a.title, a.abstract, a.publication_year,
-                j.name AS journal_name
-            FROM articles a
-            LEFT JOIN journals j ON a.journal_id = j.id
-            WHERE a.id = %s
-            """,
-            (article_id,)
-        )
+        row = execute_single_query(self.HYDRATED_ARTICLE_QUERY + " WHERE a.id = %s", (article_id,))
+        return self._row_to_hydrated_article(row) if row else None
 
-        if not row:
-            return None
-        
-        article = self._row_to_article(row)
-        article.authors = self._get_authors_for_article(article_id)
-        article.mesh_terms = self._get_mesh_terms_for_article(article_id)
-        return article
-        return article
+    def get_by_pmids(self, pmids: list[str]) -> list[Article]:
+        if not pmids:
+            return []
+
+        rows = execute_query(self.HYDRATED_ARTICLE_QUERY + " WHERE a.pmid = ANY(%s)", (list(pmids),))
+        articles = {row["pmid"]: self._row_to_hydrated_article(row) for row in rows}
+        return [articles[pmid] for pmid in pmids if pmid in articles]
+
+    def get_by_ids(self, article_ids: list[int]) -> list[Article]:
+        if not article_ids:
+            return []
+
+        rows = execute_query(self.HYDRATED_ARTICLE_QUERY + " WHERE a.id = ANY(%s)", (list(article_ids),))
+        articles = {row["id"]: self._row_to_hydrated_article(row) for row in rows}
+        return [articles[article_id] for article_id in article_ids if article_id in articles]
 
     def search(
             self,
@@ -62,67 +75,212 @@ class ArticleCRUD:
             journal: Optional[str] = None,
             author_name: Optional[str] = None,
             mesh_term: Optional[str] = None,
+            topic: Optional[str] = None,
+            ranked: bool = False,
+            snippets: bool = False,
             limit: int = 10,
-            offset: int = 0
+            offset: int = 0,
+            cursor: Optional[str] = None
         )-> list[Article]:
+        return self.search_page(
+            keyword=keyword,
+            year=year,
+            year_from=year_from,
+            year_to=year_to,
+            journal=journal,
+            author_name=author_name,
+            mesh_term=mesh_term,
+            topic=topic,
+            ranked=ranked,
+            snippets=snippets,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        ).articles
 
-        query = """
-        SELECT DISTINCT 
-            a.id, a.pmid, a.title, a.abstract, a.publication_year, j.name AS journal_name
-        FROM articles a
-        LEFT JOIN journals j ON a.journal_id = j.id
-        LEFT JOIN article_authors aa ON a.id = aa.article_id
-        LEFT JOIN authors au ON aa.author_id = au.id
-        LEFT JOIN article_mesh_terms amt ON a.id = amt.article_id
-        LEFT JOIN mesh_terms mt ON amt.mesh_term_id = mt.id
-        WHERE 1=1
-        """
+    def search_page(
+            self,
+            keyword: Optional[str] = None,
+            year: Optional[int] = None,
+            year_from: Optional[int] = None,
+            year_to: Optional[int] = None,
+            journal: Optional[str] = None,
+            author_name: Optional[str] = None,
+            mesh_term: Optional[str] = None,
+            topic: Optional[str] = None,
+            ranked: bool = False,
+            snippets: bool = False,
+            limit: int = 10,
+            offset: int = 0,
+            cursor: Optional[str] = None
+        ) -> ArticlePage:
+        conditions, params = self._build_search_filters(
+            keyword=keyword,
+            year=year,
+            year_from=year_from,
+            year_to=year_to,
+            journal=journal,
+            author_name=author_name,
+            mesh_term=mesh_term,
+            topic=topic
+        )
 
-        params = []
+        position = self._decode_cursor(cursor) if cursor else {"offset": offset}
+        ranked = ranked and bool(keyword)
+        keyset = position.get("key") if not ranked else None
+        backward = keyset is not None and position.get("direction") == "previous"
+        offset = 0 if keyset is not None else position.get("offset", 0)
 
-        if keyword:
-            query += """
-            AND (
-                to_tsvector('english', a.title) @@ plainto_tsquery('english', %s)
-                OR to_tsvector('english', COALESCE(a.abstract, '')) @@ plainto_tsquery('english', %s)
-                )
+        if keyset is not None:
+            conditions.append(f"({self.SORT_KEY}, a.id) {'>' if backward else '<'} (%s, %s)")
+            params.extend(keyset)
+
+        query = f"SELECT a.id, {self.SORT_KEY} AS sort_key FROM articles a"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        if ranked:
+            query += " ORDER BY ts_rank_cd(a.search_vector, websearch_to_tsquery('english', %s)) DESC, a.pmid"
+            params.append(keyword)
+        else:
+            direction = "ASC" if backward else "DESC"
+            query += f" ORDER BY {self.SORT_KEY} {direction}, a.id {direction}"
+        query += " LIMIT %s OFFSET %s"
+        params.extend([limit + 1, offset])
+
+        rows = execute_query(query, tuple(params))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        articles = self.get_by_ids([row["id"] for row in rows])
+        if snippets and keyword:
+            self._add_snippets(articles, keyword)
+
+        page = ArticlePage(articles=articles)
+        if ranked:
+            if has_more:
+                page.next_cursor = self._encode_cursor({"offset": offset + limit})
+            if offset > 0:
+                page.previous_cursor = self._encode_cursor({"offset": max(0, offset - limit)})
+        elif rows:
+            has_next = True if backward else has_more
+            has_previous = has_more if backward else (keyset is not None or offset > 0)
+            if has_next:
+                page.next_cursor = self._encode_cursor({"key": [rows[-1]["sort_key"], rows[-1]["id"]], "direction": "next"})
+            if has_previous:
+                page.previous_cursor = self._encode_cursor({"key": [rows[0]["sort_key"], rows[0]["id"]], "direction": "previous"})
+        return page
+
+    def _encode_cursor(self, position: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+    def _decode_cursor(self, cursor: str) -> dict:
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except ValueError as e:
+            raise ValueError(f"Invalid search cursor: {cursor}") from e
+
+        if isinstance(position, dict):
+            offset = position.get("offset")
+            key = position.get("key")
+            if self._is_int(offset) and offset >= 0:
+                return position
+            if (
+                isinstance(key, list)
+                and len(key) == 2
+                and all(self._is_int(value) for value in key)
+                and position.get("direction") in ("next", "previous")
+            ):
+                return position
+        raise ValueError(f"Invalid search cursor: {cursor}")
+
+    @staticmethod
+    def _is_int(value) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def _add_snippets(self, articles: list[Article], keyword: str) -> None:
+        if not articles:
+            return
+
+        rows = execute_query(
             """
+            SELECT
+                a.id,
+                ts_headline(
+                    'english',
+                    COALESCE(a.title, '') || ' ' || COALESCE(a.abstract, ''),
+                    websearch_to_tsquery('english', %s),
+                    'StartSel=**, StopSel=**, MaxFragments=2, MaxWords=30, MinWords=10'
+                ) AS snippet
+            FROM articles a
+            WHERE a.id = ANY(%s)
+            """,
+            (keyword, [article.id for article in articles])
+        )
+        snippets = {row["id"]: row["snippet"] for row in rows}
+        for article in articles:
+            article.snippet = snippets.get(article.id)
 
-            params.extend([keyword, keyword])
+    def _build_search_filters(
+            self,
+            keyword: Optional[str] = None,
+            year: Optional[int] = None,
+            year_from: Optional[int] = None,
+            year_to: Optional[int] = None,
+            journal: Optional[str] = None,
+            author_name: Optional[str] = None,
+            mesh_term: Optional[str] = None,
+            topic: Optional[str] = None
+        ) -> tuple[list[str], list]:
+        conditions = []
+        params = []
 
-            if year:
-                query += " AND a.publication_year = %s"
-                params.append(year)
+        if keyword:
+            conditions.append("a.search_vector @@ websearch_to_tsquery('english', %s)")
+            params.append(keyword)
 
-            if year_from:
-                query += " AND a.publication_year >= %s"
-                params.append(year_from)
+        if year:
+            conditions.append("a.publication_year = %s")
+            params.append(year)
 
-            if year_to:
-                query += " AND a.publication_year <= %s"
-                params.append(year_to)
+        if year_from:
+            conditions.append("a.publication_year >= %s")
+            params.append(year_from)
 
-            if journal:
-                query += " AND j.name ILIKE %s"
-                params.append(f"%{journal}%")
+        if year_to:
+            conditions.append("a.publication_year <= %s")
+            params.append(year_to)
 
-            if author_name:
-                query += " AND (au.first_name || ' ' || au.last_name) ILIKE %s"
-                params.append(f"%{author_name}%")
+        if journal:
+            conditions.append("EXISTS (SELECT 1 FROM journals j WHERE j.id = a.journal_id AND j.name ILIKE %s)")
+            params.append(f"%{journal}%")
 
-            if mesh_term:
-                query += " AND mt.term ILIKE %s"
-                params.append(f"%{mesh_term}%")
+        if author_name:
+            conditions.append("""EXISTS (
+                SELECT 1 FROM article_authors aa
+                JOIN authors au ON au.id = aa.author_id
+                WHERE aa.article_id = a.id AND (au.first_name || ' ' || au.last_name) ILIKE %s
+            )""")
+            params.append(f"%{author_name}%")
 
-        query += " ORDER BY a.publication_year DESC NULLS LAST, a.pmid LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if mesh_term:
+            conditions.append("""EXISTS (
+                SELECT 1 FROM article_mesh_terms amt
+                JOIN mesh_terms mt ON mt.id = amt.mesh_term_id
+                WHERE amt.article_id = a.id AND mt.term ILIKE %s
+            )""")
+            params.append(f"%{mesh_term}%")
 
-        rows = execute_query(query, tuple(params))
+        if topic:
+            conditions.append("EXISTS (SELECT 1 FROM article_topics t WHERE t.article_id = a.id AND t.topic = %s)")
+            params.append(topic)
 
-        return [self._row_to_article(row) for row in rows]
+        return conditions, params
     
-    def get_all(self, limit: int = 10, offset: int = 0) -> list[Article]:
-        return self.search(limit=limit, offset=offset)
+    def get_all(self, limit: int = 10, offset: int = 0, cursor: Optional[str] = None) -> list[Article]:
+        return self.search(limit=limit, offset=offset, cursor=cursor)
     
     def count(self) -> int:
         row = execute_single_query("SELECT COUNT(*) AS count FROM articles")
@@ -136,6 +294,10 @@ class ArticleCRUD:
         rows = execute_query("SELECT DISTINCT j.name FROM journals j ORDER BY j.name ASC")
         return [row["name"] for row in rows]
     
+    def get_topics(self) -> list[str]:
+        rows = execute_query("SELECT DISTINCT topic FROM article_topics ORDER BY topic ASC")
+        return [row["topic"] for row in rows]
+    
     def get_top_mesh_terms(self, limit: int = 20) -> list[str]:
         return execute_query(
             """
@@ -151,6 +313,7 @@ class ArticleCRUD:
     
     def _row_to_article(self, row: dict) -> Article:
         return Article(
+            id=row.get("id"),
             pmid=row["pmid"],
             title=row["title"],
             abstract=row.get("abstract"),
@@ -159,37 +322,15 @@ class ArticleCRUD:
             created_at=row.get("created_at")
         )
     
-    def _get_authors_for_article(self, article_id: int) -> list[Author]:
-        rows = execute_query(
-            """
-            SELECT au.last_name, au.first_name, au.affiliation
-            FROM authors au
-            JOIN article_authors aa ON au.id = aa.author_id
-            WHERE aa.article_id = %s
-            ORDER BY aa.author_postion ASC
-            """,
-            (article_id,)
-        )
-
-        return [
+    def _row_to_hydrated_article(self, row: dict) -> Article:
+        article = self._row_to_article(row)
+        article.authors = [
             Author(
-                last_name=row["last_name"],
-                first_name=row.get("first_name"),
-                affiliation=row.get("affiliation")
+                last_name=author["last_name"],
+                first_name=author.get("first_name"),
+                affiliation=author.get("affiliation")
             )
-            for row in rows
+            for author in row["authors"]
         ]
-    
-    def _get_mesh_terms_for_article(self, article_id: int) -> list[str]:
-        rows = execute_query(
-            """
-            SELECT mt.term
-            FROM mesh_terms mt
-            JOIN article_mesh_terms amt ON mt.id = amt.mesh_term_id
-            WHERE amt.article_id = %s
-            ORDER BY mt.term ASC
-            """,
-            (article_id,)
-        )
-
-        return [row["term"] for row in rows]
\ No newline at end of file
+        article.mesh_terms = list(row["mesh_terms"])
+        return article
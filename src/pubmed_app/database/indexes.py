@@ -0,0 +1,76 @@
+import re
+from typing import Callable, Optional
+
+from pubmed_app.config import logger
+from pubmed_app.database.connection import get_db_connection, get_raw_connection
+
+LOAD_TABLES = ('articles', 'authors', 'journals', 'mesh_terms', 'article_authors', 'article_mesh_terms', 'article_topics')
+
+def defer_indexes(tables: tuple[str, ...] = LOAD_TABLES) -> list[dict]:
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT index_name FROM deferred_indexes")
+            already_deferred = {row['index_name'] for row in cur.fetchall()}
+
+            cur.execute("""
+                SELECT i.indexname AS index_name, i.tablename AS table_name, i.indexdef AS definition
+                FROM pg_indexes i
+                WHERE i.schemaname = 'public'
+                    AND i.tablename = ANY(%s)
+                    AND NOT EXISTS (
+                        SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname
+                    )
+                ORDER BY i.tablename, i.indexname
+            """, (list(tables),))
+            indexes = cur.fetchall()
+
+            for index in indexes:
+                if index['index_name'] not in already_deferred:
+                    cur.execute(
+                        "INSERT INTO deferred_indexes (index_name, table_name, definition) VALUES (%s, %s, %s)",
+                        (index['index_name'], index['table_name'], index['definition'])
+                    )
+                cur.execute(f"DROP INDEX IF EXISTS {index['index_name']}")
+
+    logger.info(f"Dropped {len(indexes)} secondary indexes, {len(already_deferred)} were already deferred")
+    return [dict(index) for index in indexes]
+
+def get_deferred_indexes() -> list[dict]:
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT index_name, table_name, definition FROM deferred_indexes ORDER BY table_name, index_name")
+            return [dict(row) for row in cur.fetchall()]
+
+def rebuild_indexes(
+        concurrently: bool = True,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> int:
+    indexes = get_deferred_indexes()
+
+    with get_raw_connection(autocommit=True) as conn:
+        with conn.cursor() as cur:
+            for number, index in enumerate(indexes, start=1):
+                if on_progress is not None:
+                    on_progress(number, len(indexes), index['index_name'])
+
+                cur.execute(_drop_statement(index['index_name'], concurrently))
+                cur.execute(_build_statement(index['definition'], concurrently))
+                cur.execute("DELETE FROM deferred_indexes WHERE index_name = %s", (index['index_name'],))
+                logger.info(f"Rebuilt index {index['index_name']} ({number}/{len(indexes)})")
+
+    return len(indexes)
+
+def analyze_tables(tables: tuple[str, ...] = LOAD_TABLES) -> None:
+    with get_raw_connection(autocommit=True) as conn:
+        with conn.cursor() as cur:
+            for table in tables:
+                cur.execute(f"ANALYZE {table}")
+                logger.info(f"Analyzed table {table}")
+
+def _drop_statement(index_name: str, concurrently: bool) -> str:
+    return f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {index_name}"
+
+def _build_statement(definition: str, concurrently: bool) -> str:
+    if not concurrently:
+        return definition
+    return re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", definition)
@@ -0,0 +1,51 @@
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(abstract, '')), 'B')
+) STORED;
+
+DROP INDEX IF EXISTS idx_article_title;
+DROP INDEX IF EXISTS idx_article_abstract;
+CREATE INDEX IF NOT EXISTS idx_article_sort_key ON articles((COALESCE(publication_year, 0)), id);
+CREATE INDEX IF NOT EXISTS idx_article_search_vector ON articles USING gin(search_vector);
+
+CREATE TABLE IF NOT EXISTS article_topics (
+    article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+    topic TEXT NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (article_id, topic)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_topics_topic ON article_topics(topic);
+
+CREATE TABLE IF NOT EXISTS etl_sync_state (
+    topic TEXT PRIMARY KEY,
+    last_synced_date DATE NOT NULL,
+    articles_found INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    file_name VARCHAR(256) PRIMARY KEY,
+    articles_inserted INTEGER NOT NULL DEFAULT 0,
+    articles_deleted INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS etl_checkpoints (
+    job_name VARCHAR(256) PRIMARY KEY,
+    topic TEXT NOT NULL,
+    retmax INTEGER NOT NULL,
+    batch_size INTEGER NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS deferred_indexes (
+    index_name VARCHAR(256) PRIMARY KEY,
+    table_name VARCHAR(256) NOT NULL,
+    definition TEXT NOT NULL,
+    dropped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
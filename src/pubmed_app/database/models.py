@@ -39,6 +39,7 @@ class Article:
     authors: list[Author] = field(default_factory=list)
     mesh_terms: list[MeshTerm] = field(default_factory=list)
     created_at: Optional[datetime] = None
+    snippet: Optional[str] = None
 
     authors: list[Author] = field(default_factory=list)
     mesh_terms: list[str] = field(default_factory=list)
@@ -57,4 +58,10 @@ class Article:
 
     @property
     def author_names(self) -> str:
-        return ", ".join(author.full_name for author in self.authors)
\ No newline at end of file
+        return ", ".join(author.full_name for author in self.authors)
+
+@dataclass
+class ArticlePage:
+    articles: list[Article] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
@@ -1,3 +1,8 @@
+DROP TABLE IF EXISTS article_topics CASCADE;
+DROP TABLE IF EXISTS deferred_indexes CASCADE;
+DROP TABLE IF EXISTS etl_checkpoints CASCADE;
+DROP TABLE IF EXISTS ingested_files CASCADE;
+DROP TABLE IF EXISTS etl_sync_state CASCADE;
 DROP TABLE IF EXISTS article_mesh_terms CASCADE;
 DROP TABLE IF EXISTS article_authors CASCADE;
 DROP TABLE IF EXISTS articles CASCADE;
@@ -42,15 +47,20 @@ CREATE TABLE articles (
     abstract TEXT,
     journal_id INTEGER REFERENCES journals(id) ON DELETE SET NULL,
     publication_year INTEGER,
+    content_hash CHAR(64),
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(abstract, '')), 'B')
+    ) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_article_pmid ON articles(pmid);
 CREATE INDEX idx_article_publication_year ON articles(publication_year);
+CREATE INDEX idx_article_sort_key ON articles((COALESCE(publication_year, 0)), id);
 CREATE INDEX idx_article_journal_id ON articles(journal_id);
-CREATE INDEX idx_article_title ON articles USING gin(to_tsvector('english', title));
-CREATE INDEX idx_article_abstract ON articles USING gin(to_tsvector('english', abstract));
+CREATE INDEX idx_article_search_vector ON articles USING gin(search_vector);
 
 CREATE TABLE article_authors (
     id SERIAL PRIMARY KEY,
@@ -77,6 +87,47 @@ CREATE TABLE article_mesh_terms (
 CREATE INDEX idx_article_mesh_terms_article_id ON article_mesh_terms(article_id);
 CREATE INDEX idx_article_mesh_terms_mesh_term_id ON article_mesh_terms(mesh_term_id);
 
+CREATE TABLE article_topics (
+    article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+    topic TEXT NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (article_id, topic)
+);
+
+CREATE INDEX idx_article_topics_topic ON article_topics(topic);
+
+CREATE TABLE etl_sync_state (
+    topic TEXT PRIMARY KEY,
+    last_synced_date DATE NOT NULL,
+    articles_found INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE ingested_files (
+    file_name VARCHAR(256) PRIMARY KEY,
+    articles_inserted INTEGER NOT NULL DEFAULT 0,
+    articles_deleted INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE etl_checkpoints (
+    job_name VARCHAR(256) PRIMARY KEY,
+    topic TEXT NOT NULL,
+    retmax INTEGER NOT NULL,
+    batch_size INTEGER NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE deferred_indexes (
+    index_name VARCHAR(256) PRIMARY KEY,
+    table_name VARCHAR(256) NOT NULL,
+    definition TEXT NOT NULL,
+    dropped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE OR REPLACE VIEW v_articles_full AS
 SELECT
     a.id AS article_id,
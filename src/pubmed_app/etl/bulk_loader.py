@@ -0,0 +1,204 @@
+import io
+from typing import Iterable
+
+from pubmed_app.config import logger
+from pubmed_app.database.connection import get_db_connection
+from pubmed_app.etl.loader import DatabaseLoader, LoaderStats, merge_stats
+from pubmed_app.etl.transformer import Article
+
+STAGING_TABLES_SQL = """
+CREATE TEMP TABLE stage_articles (
+    pmid VARCHAR(32),
+    title TEXT,
+    abstract TEXT,
+    publication_year INTEGER,
+    journal_name VARCHAR(512),
+    content_hash CHAR(64)
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE stage_authors (
+    pmid VARCHAR(32),
+    author_postion INTEGER,
+    last_name VARCHAR(256),
+    first_name VARCHAR(256)
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE stage_mesh_terms (
+    pmid VARCHAR(32),
+    term VARCHAR(512)
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE stage_written_articles (
+    id INTEGER,
+    pmid VARCHAR(32)
+) ON COMMIT DROP;
+"""
+
+class BulkDatabaseLoader(DatabaseLoader):
+    def load(self, articles: list[Article]) -> dict:
+        total_stats = self._stats_to_dict(LoaderStats())
+        logger.info(f"Starting bulk load of {len(articles)} articles into the database.")
+
+        for start in range(0, len(articles), self.commit_size):
+            chunk = articles[start:start + self.commit_size]
+            stats = LoaderStats()
+            try:
+                with get_db_connection() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(STAGING_TABLES_SQL)
+                        self._copy_staging_rows(cursor, chunk)
+                        self._merge(cursor, stats)
+            except Exception as e:
+                logger.warning(f"Bulk load of {len(chunk)} articles failed ({e}), falling back to row-level loading")
+                merge_stats(total_stats, super().load(chunk))
+                continue
+
+            stats.articles_skipped = len(chunk) - stats.articles_inserted - stats.articles_updated
+            merge_stats(total_stats, self._stats_to_dict(stats))
+
+        logger.info(f"Bulk loading complete: {total_stats['articles_inserted']} articles inserted, {total_stats['articles_updated']} articles updated, {total_stats['articles_skipped']} articles skipped, {total_stats['articles_failed']} articles failed")
+
+        return total_stats
+
+    def _copy_staging_rows(self, cursor, articles: list[Article]) -> None:
+        self._copy(
+            cursor,
+            "stage_articles (pmid, title, abstract, publication_year, journal_name, content_hash)",
+            ((a.pmid, a.title, a.abstract, a.year, a.journal, a.content_hash()) for a in articles)
+        )
+        self._copy(
+            cursor,
+            "stage_authors (pmid, author_postion, last_name, first_name)",
+            (
+                (a.pmid, position, author.last_name, author.fore_name)
+                for a in articles
+                for position, author in enumerate(a.authors, start=1)
+            )
+        )
+        self._copy(
+            cursor,
+            "stage_mesh_terms (pmid, term)",
+            ((a.pmid, term) for a in articles for term in a.mesh_terms)
+        )
+
+    def _copy(self, cursor, target: str, rows: Iterable[tuple]) -> None:
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(self._copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {target} FROM STDIN", buffer)
+
+    def _copy_value(self, value) -> str:
+        if value is None:
+            return "\\N"
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def _merge(self, cursor, stats: LoaderStats) -> None:
+        cursor.execute(
+            """
+            INSERT INTO journals (name)
+            SELECT DISTINCT journal_name FROM stage_articles WHERE journal_name IS NOT NULL
+            ORDER BY journal_name
+            ON CONFLICT (name) DO NOTHING
+            """
+        )
+        stats.journals_inserted += cursor.rowcount
+
+        if self.update:
+            self._merge_updates(cursor, stats)
+
+        cursor.execute(
+            """
+            WITH inserted AS (
+                INSERT INTO articles (pmid, title, abstract, publication_year, journal_id, content_hash)
+                SELECT s.pmid, s.title, s.abstract, s.publication_year, j.id, s.content_hash
+                FROM stage_articles s
+                LEFT JOIN journals j ON j.name = s.journal_name
+                ON CONFLICT (pmid) DO NOTHING
+                RETURNING id, pmid
+            )
+            INSERT INTO stage_written_articles (id, pmid)
+            SELECT id, pmid FROM inserted
+            """
+        )
+        stats.articles_inserted += cursor.rowcount
+
+        cursor.execute(
+            """
+            INSERT INTO authors (last_name, first_name)
+            SELECT DISTINCT s.last_name, s.first_name
+            FROM stage_authors s
+            JOIN stage_written_articles na ON na.pmid = s.pmid
+            ORDER BY s.last_name, s.first_name
+            ON CONFLICT (last_name, first_name) DO NOTHING
+            """
+        )
+        stats.authors_inserted += cursor.rowcount
+
+        cursor.execute(
+            """
+            INSERT INTO article_authors (article_id, author_id, author_postion)
+            SELECT na.id, au.id, s.author_postion
+            FROM stage_authors s
+            JOIN stage_written_articles na ON na.pmid = s.pmid
+            JOIN authors au ON au.last_name = s.last_name
+                AND au.first_name IS NOT DISTINCT FROM s.first_name
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+        cursor.execute(
+            """
+            INSERT INTO mesh_terms (term)
+            SELECT DISTINCT s.term
+            FROM stage_mesh_terms s
+            JOIN stage_written_articles na ON na.pmid = s.pmid
+            ORDER BY s.term
+            ON CONFLICT (term) DO NOTHING
+            """
+        )
+        stats.mesh_terms_inserted += cursor.rowcount
+
+        cursor.execute(
+            """
+            INSERT INTO article_mesh_terms (article_id, mesh_term_id)
+            SELECT na.id, mt.id
+            FROM stage_mesh_terms s
+            JOIN stage_written_articles na ON na.pmid = s.pmid
+            JOIN mesh_terms mt ON mt.term = s.term
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+    def _merge_updates(self, cursor, stats: LoaderStats) -> None:
+        cursor.execute(
+            """
+            WITH updated AS (
+                UPDATE articles a SET
+                    title = s.title,
+                    abstract = s.abstract,
+                    publication_year = s.publication_year,
+                    journal_id = j.id,
+                    content_hash = s.content_hash,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM stage_articles s
+                LEFT JOIN journals j ON j.name = s.journal_name
+                WHERE a.pmid = s.pmid
+                    AND a.content_hash IS DISTINCT FROM s.content_hash
+                RETURNING a.id, a.pmid
+            )
+            INSERT INTO stage_written_articles (id, pmid)
+            SELECT id, pmid FROM updated
+            """
+        )
+        stats.articles_updated += cursor.rowcount
+
+        cursor.execute("DELETE FROM article_authors WHERE article_id IN (SELECT id FROM stage_written_articles)")
+        cursor.execute("DELETE FROM article_mesh_terms WHERE article_id IN (SELECT id FROM stage_written_articles)")
@@ -0,0 +1,88 @@
+import gzip
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from pubmed_app.config.logger import logger
+
+class ResponseCache:
+    INDEX_FILE = "index.sqlite"
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(self.cache_dir / self.INDEX_FILE, check_same_thread=False)
+        self._index.execute(
+            """
+            CREATE TABLE IF NOT EXISTS batches (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                topic TEXT,
+                pmid_count INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._index.commit()
+
+    @staticmethod
+    def make_key(pmids: list[str]) -> str:
+        return hashlib.sha256(",".join(sorted(pmids)).encode("utf-8")).hexdigest()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}.xml.gz"
+
+    def put(self, pmids: list[str], xml_string: str, topic: Optional[str] = None) -> str:
+        key = self.make_key(pmids)
+        path = self._object_path(key)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(xml_string)
+            tmp_path.replace(path)
+
+        with self._lock:
+            self._index.execute(
+                """
+                INSERT INTO batches (key, path, topic, pmid_count, size)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET topic = COALESCE(excluded.topic, batches.topic)
+                """,
+                (key, str(path.relative_to(self.cache_dir)), topic, len(pmids), path.stat().st_size)
+            )
+            self._index.commit()
+
+        logger.debug(f"Cached batch of {len(pmids)} PMIDs as {key}")
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._object_path(key)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def keys(self, topic: Optional[str] = None) -> list[str]:
+        with self._lock:
+            if topic:
+                rows = self._index.execute(
+                    "SELECT key FROM batches WHERE topic = ? ORDER BY created_at, key", (topic,)
+                ).fetchall()
+            else:
+                rows = self._index.execute("SELECT key FROM batches ORDER BY created_at, key").fetchall()
+        return [row[0] for row in rows]
+
+    def iter_batches(self, topic: Optional[str] = None) -> Iterator[str]:
+        for key in self.keys(topic):
+            xml_string = self.get(key)
+            if xml_string is None:
+                logger.warning(f"Cached batch {key} is missing from {self.objects_dir}, skipping")
+                continue
+            yield xml_string
@@ -1,45 +1,478 @@
+import threading
+from collections import deque
+from datetime import date
+from typing import Callable, Iterator, Optional
+
 from pubmed_app.config.logger import logger
 from pubmed_app.etl.pubmend_client import PubMedClient
-from pubmed_app.etl.parser import PubMedParser
-from pubmed_app.etl.transformer import ArticleTransformer
-from pubmed_app.etl.loader import DatabaseLoader
+from pubmed_app.etl.parser import create_parser
+from pubmed_app.etl.transformer import ArticleTransformer, Article
+from pubmed_app.etl.loader import DatabaseLoader, merge_stats
+from pubmed_app.etl.bulk_loader import BulkDatabaseLoader
+from pubmed_app.etl.parallel_loader import ParallelDatabaseLoader
+from pubmed_app.etl.cache import ResponseCache
+from pubmed_app.etl.planner import QueryPlanner, FetchUnit
+from pubmed_app.etl.manifest import ManifestTopic
+from pubmed_app.etl.parallel import ParseTransformPool, parse_and_transform
+from pubmed_app.etl.staged import Stage, StagedPipeline
 
 class ETLPipeline:
-    def __init__(self, email: str, api_key: str = None):
+    def __init__(
+            self,
+            email: str,
+            api_key: str = None,
+            cache_dir: Optional[str] = None,
+            parser_backend: str = "auto",
+            parse_workers: int = 1,
+            ordered: bool = True,
+            staged: bool = False,
+            load_workers: int = 1,
+            queue_size: int = 4,
+            bulk_load: bool = False,
+            warm_cache: bool = False,
+            commit_size: int = 500,
+            update: bool = False,
+            skip_existing: bool = False,
+            load_processes: int = 1
+        ):
         self.client = PubMedClient(email=email, api_key=api_key)
-        self.parser = PubMedParser()
+        self.parser = create_parser(parser_backend)
         self.transformer = ArticleTransformer()
-        self.loader = DatabaseLoader()
+        if load_processes > 1:
+            self.loader = ParallelDatabaseLoader(load_processes, bulk_load=bulk_load, commit_size=commit_size, update=update)
+        else:
+            loader_class = BulkDatabaseLoader if bulk_load else DatabaseLoader
+            self.loader = loader_class(commit_size=commit_size, update=update)
+        if warm_cache and not bulk_load and load_processes <= 1:
+            self.loader.warm_cache()
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.planner = QueryPlanner(self.client)
+        self.skip_existing = skip_existing
+        if skip_existing and update:
+            logger.warning("Update mode needs to refetch existing articles to detect changes, ignoring skip_existing.")
+            self.skip_existing = False
+        self.staged = staged
+        self.stage_workers = {"parse": parse_workers, "load": load_workers}
+        self.queue_size = queue_size
+        self.parse_pool = None
+        if parse_workers > 1:
+            self.parse_pool = ParseTransformPool(parse_workers, parser_backend, ordered)
+
+    def close(self) -> None:
+        if isinstance(self.loader, ParallelDatabaseLoader):
+            self.loader.close()
 
-    def run(self, search_term: str, retmax: int = 20):
+    def run(
+            self,
+            search_term: str,
+            retmax: int = 20,
+            batch_size: int = PubMedClient.FETCH_BATCH_SIZE,
+            fetch_workers: int = 1,
+            incremental: bool = False,
+            job_name: Optional[str] = None,
+            start: int = 0
+        ):
         logger.info(f"Starting ETL pipeline for search term: {search_term}")
+
+        checkpointing = job_name is not None and self._is_ordered()
+        if job_name is not None and not checkpointing:
+            logger.warning("Checkpoints need ordered processing, job progress will not be recorded in staged or unordered mode.")
+
+        mindate, maxdate = None, None
+        if incremental:
+            sync_date = date.today()
+            maxdate = sync_date
+            mindate = self.loader.get_watermark(search_term)
+            if mindate:
+                logger.info(f"Incremental sync from watermark {mindate} to {maxdate}")
+            else:
+                logger.info(f"No watermark found for topic, running full sync up to {maxdate}")
         
         logger.info("Extracting data from PubMed")
-        search_results = self.client.search(term=search_term, retmax=retmax)
-        id_list = search_results.get("esearchresult", {}).get("idlist", [])
-        logger.info(f"Found {len(id_list)} articles")
+        search_results = self.client.search(
+            term=search_term,
+            retmax=0,
+            usehistory=True,
+            mindate=self._format_date(mindate),
+            maxdate=self._format_date(maxdate)
+        )
+        esearch_result = search_results.get("esearchresult", {})
+        count = int(esearch_result.get("count", 0))
+        total = min(count, retmax)
+        logger.info(f"Found {count} articles, fetching {total}")
 
-        if not id_list:
+        if not total:
             logger.warning("No articles found, ending pipeline.")
+            if incremental:
+                self.loader.save_watermark(search_term, sync_date, count)
             return
 
-        logger.info("Transforming data")
-        fetched_data = self.client.fetch(id_list=id_list)
+        if start:
+            logger.info(f"Resuming from position {start}")
+
+        units = None
+        if total > self.planner.max_ids:
+            logger.info(f"{total} articles exceed the esearch limit of {self.planner.max_ids}, partitioning by date")
+            units = self.planner.plan(search_term, mindate=mindate, maxdate=maxdate, limit=total)
+
+        if self.skip_existing:
+            units = units or [FetchUnit(mindate=mindate, maxdate=maxdate, count=total)]
+            positioned_batches = self._fetch_missing(search_term, units, total, batch_size, fetch_workers, start, checkpointing)
+        elif units:
+            positioned_batches = self._fetch_units(search_term, units, total, batch_size, fetch_workers, start)
+        else:
+            positioned_batches = zip(
+                self.client.fetch_history(
+                    webenv=esearch_result["webenv"],
+                    query_key=esearch_result["querykey"],
+                    count=total,
+                    batch_size=batch_size,
+                    max_workers=fetch_workers,
+                    start=start,
+                    ordered=checkpointing
+                ),
+                (min(retstart + batch_size, total) for retstart in range(start, total, batch_size))
+            )
+
+        positions = deque()
+        on_batch_done = None
+        failed_position = None
+        if checkpointing:
+            self.loader.save_checkpoint(job_name, search_term, retmax, batch_size, start)
 
-        logger.info(f"Fetched data length: {len(fetched_data)} characters")
+            def on_batch_done(stats: dict):
+                nonlocal failed_position
+                position = positions.popleft()
+                if failed_position is not None:
+                    return
+                if stats.get("articles_failed"):
+                    failed_position = position
+                    logger.warning(f"Batch ending at position {position} had {stats['articles_failed']} failed articles, holding the checkpoint.")
+                    return
+                self.loader.save_checkpoint(job_name, search_term, retmax, batch_size, position)
 
-        parsed_articles = self.parser.parse(fetched_data)
-        transformed_articles = self.transformer.transform(parsed_articles)
-   
-        logger.info(f"Transformed {len(transformed_articles)} articles")
+        batches = self._track_positions(positioned_batches, positions)
+        total_stats = self._process_batches(batches, topic=search_term, on_batch_done=on_batch_done)
+        logger.info(f"Fetch stats: {self.client.get_stats()}")
 
-        if not transformed_articles:
+        if checkpointing and failed_position is None:
+            self.loader.save_checkpoint(job_name, search_term, retmax, batch_size, total, completed=True)
+
+        if incremental:
+            if count > retmax:
+                logger.warning(f"Only {retmax} of {count} new articles were fetched, keeping the previous watermark.")
+            elif total_stats.get("articles_failed"):
+                logger.warning(f"{total_stats['articles_failed']} articles failed to load, keeping the previous watermark.")
+            else:
+                self.loader.save_watermark(search_term, sync_date, count)
+
+        if not total_stats:
             logger.warning("No articles to load, ending pipeline.")
             return {"error": "No articles to load"}
 
-        logger.info("Loading data to destination")
-        stats = self.loader.load(transformed_articles)
-        logger.info(f"Load stats: {stats}")
-
+        logger.info(f"Load stats: {total_stats}")
         logger.info("ETL pipeline completed successfully")
-        return stats
\ No newline at end of file
+        return total_stats
+
+    def run_manifest(
+            self,
+            topics: list[ManifestTopic],
+            batch_size: int = PubMedClient.FETCH_BATCH_SIZE,
+            fetch_workers: int = 1
+        ) -> dict:
+        logger.info(f"Starting manifest ETL for {len(topics)} topics")
+
+        memberships = {}
+        for topic in topics:
+            pmids = self._search_pmids(topic.term, topic.max_results)
+            memberships.setdefault(topic.name, []).extend(pmids)
+            logger.info(f"Topic {topic.name}: {len(pmids)} articles")
+
+        all_pmids = list(dict.fromkeys(pmid for pmids in memberships.values() for pmid in pmids))
+        found = sum(len(pmids) for pmids in memberships.values())
+        logger.info(f"Found {len(all_pmids)} unique articles across topics ({found - len(all_pmids)} overlapping)")
+
+        if self.skip_existing:
+            missing = []
+            for offset in range(0, len(all_pmids), batch_size):
+                missing.extend(self.loader.filter_missing_pmids(all_pmids[offset:offset + batch_size]))
+            logger.info(f"Skipping {len(all_pmids) - len(missing)} articles that are already loaded")
+            all_pmids = missing
+
+        id_batches = (all_pmids[offset:offset + batch_size] for offset in range(0, len(all_pmids), batch_size))
+        batches = self.client.fetch_ids(id_batches, max_workers=fetch_workers, ordered=self._is_ordered())
+        total_stats = self._process_batches(batches)
+        logger.info(f"Fetch stats: {self.client.get_stats()}")
+
+        total_stats["topic_members_added"] = sum(
+            self.loader.save_topic_members(name, pmids) for name, pmids in memberships.items()
+        )
+
+        logger.info(f"Load stats: {total_stats}")
+        logger.info("Manifest ETL completed successfully")
+        return total_stats
+
+    def _search_pmids(self, search_term: str, retmax: int) -> list[str]:
+        search_results = self.client.search(term=search_term, retmax=0)
+        count = int(search_results.get("esearchresult", {}).get("count", 0))
+        total = min(count, retmax)
+        if not total:
+            return []
+
+        if total > self.planner.max_ids:
+            units = self.planner.plan(search_term, limit=total)
+        else:
+            units = [FetchUnit(mindate=None, maxdate=None, count=total)]
+        return [
+            pmid
+            for pmids, _ in self._search_id_batches(search_term, units, total, self.planner.max_ids)
+            for pmid in pmids
+        ]
+
+    def resume(self, job_name: str, fetch_workers: int = 1):
+        checkpoint = self.loader.get_checkpoint(job_name)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint found for job: {job_name}")
+        if checkpoint["completed"]:
+            logger.info(f"Job {job_name} already completed, nothing to resume.")
+            return {}
+
+        return self.run(
+            search_term=checkpoint["topic"],
+            retmax=checkpoint["retmax"],
+            batch_size=checkpoint["batch_size"],
+            fetch_workers=fetch_workers,
+            job_name=job_name,
+            start=checkpoint["position"]
+        )
+
+    def _is_ordered(self) -> bool:
+        if self.staged:
+            return False
+        return self.parse_pool is None or self.parse_pool.ordered
+
+    def _track_positions(self, positioned_batches: Iterator[tuple[str, int]], positions: deque) -> Iterator[str]:
+        for fetched_data, position in positioned_batches:
+            positions.append(position)
+            yield fetched_data
+
+    def _fetch_units(
+            self,
+            search_term: str,
+            units: list[FetchUnit],
+            total: int,
+            batch_size: int,
+            fetch_workers: int,
+            start: int = 0
+        ) -> Iterator[tuple[str, int]]:
+        position = 0
+        for unit_number, unit in enumerate(units, start=1):
+            count = min(unit.count, self.planner.max_ids, total - position)
+            if count <= 0:
+                break
+            if position + count <= start:
+                position += count
+                continue
+
+            logger.info(f"Fetching window {unit_number}/{len(units)}: {unit.mindate} - {unit.maxdate} ({unit.count} articles)")
+            search_results = self.client.search(
+                term=search_term,
+                retmax=0,
+                usehistory=True,
+                mindate=self._format_date(unit.mindate),
+                maxdate=self._format_date(unit.maxdate),
+                datetype=self.planner.datetype
+            )
+            esearch_result = search_results.get("esearchresult", {})
+            if not int(esearch_result.get("count", 0)):
+                position += count
+                continue
+
+            unit_start = max(0, start - position)
+            batches = self.client.fetch_history(
+                webenv=esearch_result["webenv"],
+                query_key=esearch_result["querykey"],
+                count=count,
+                batch_size=batch_size,
+                max_workers=fetch_workers,
+                start=unit_start,
+                ordered=True
+            )
+            for retstart, fetched_data in zip(range(unit_start, count, batch_size), batches):
+                yield fetched_data, position + min(retstart + batch_size, count)
+            position += count
+
+    def _fetch_missing(
+            self,
+            search_term: str,
+            units: list[FetchUnit],
+            total: int,
+            batch_size: int,
+            fetch_workers: int,
+            start: int = 0,
+            ordered: bool = False
+        ) -> Iterator[tuple[str, int]]:
+        positions = deque()
+        skipped = 0
+
+        def missing_batches() -> Iterator[list[str]]:
+            nonlocal skipped
+            for pmids, position in self._search_id_batches(search_term, units, total, batch_size, start):
+                missing = self.loader.filter_missing_pmids(pmids)
+                skipped += len(pmids) - len(missing)
+                if missing:
+                    positions.append(position)
+                    yield missing
+
+        for fetched_data in self.client.fetch_ids(missing_batches(), max_workers=fetch_workers, ordered=ordered):
+            yield fetched_data, positions.popleft()
+        logger.info(f"Skipped fetching {skipped} articles that are already loaded")
+
+    def _search_id_batches(
+            self,
+            search_term: str,
+            units: list[FetchUnit],
+            total: int,
+            batch_size: int,
+            start: int = 0
+        ) -> Iterator[tuple[list[str], int]]:
+        position = 0
+        for unit in units:
+            count = min(unit.count, self.planner.max_ids, total - position)
+            if count <= 0:
+                break
+            if position + count <= start:
+                position += count
+                continue
+
+            search_results = self.client.search(
+                term=search_term,
+                retmax=count,
+                mindate=self._format_date(unit.mindate),
+                maxdate=self._format_date(unit.maxdate),
+                datetype=self.planner.datetype
+            )
+            id_list = search_results.get("esearchresult", {}).get("idlist", [])[:count]
+            for retstart in range(max(0, start - position), count, batch_size):
+                yield id_list[retstart:retstart + batch_size], position + min(retstart + batch_size, count)
+            position += count
+
+    def _format_date(self, value: Optional[date]) -> Optional[str]:
+        return value.strftime(PubMedClient.DATE_FORMAT) if value else None
+
+    def replay(self, topic: Optional[str] = None):
+        if self.cache is None:
+            raise ValueError("Replay requires a cache directory")
+
+        logger.info(f"Replaying cached batches{f' for topic: {topic}' if topic else ''}")
+        total_stats = self._process_batches(self.cache.iter_batches(topic), cache_results=False)
+
+        if not total_stats:
+            logger.warning("No cached articles to load, ending replay.")
+            return {"error": "No articles to load"}
+
+        logger.info(f"Load stats: {total_stats}")
+        logger.info("ETL replay completed successfully")
+        return total_stats
+
+    def _process_batches(
+            self,
+            batches: Iterator[str],
+            topic: Optional[str] = None,
+            cache_results: bool = True,
+            on_batch_done: Optional[Callable[[dict], None]] = None
+        ) -> dict:
+        if self.staged:
+            return self._process_batches_staged(batches, topic, cache_results)
+
+        total_stats = {}
+        seen_pmids = set()
+        for batch_number, (fetched_data, pmids, transformed_articles) in enumerate(self._parse_batches(batches), start=1):
+            logger.info(f"Processed batch {batch_number} length: {len(fetched_data)} characters")
+            stats = {}
+
+            if self.cache is not None and cache_results and pmids:
+                self.cache.put(pmids, fetched_data, topic=topic)
+
+            transformed_articles = self._dedupe(transformed_articles, seen_pmids)
+            logger.info(f"Transformed {len(transformed_articles)} articles")
+
+            if transformed_articles:
+                logger.info("Loading data to destination")
+                stats = self.loader.load(transformed_articles)
+                logger.info(f"Load stats for batch {batch_number}: {stats}")
+                merge_stats(total_stats, stats)
+
+            if on_batch_done is not None:
+                on_batch_done(stats)
+
+        return total_stats
+
+    def _process_batches_staged(
+            self,
+            batches: Iterator[str],
+            topic: Optional[str] = None,
+            cache_results: bool = True
+        ) -> dict:
+        total_stats = {}
+        seen_pmids = set()
+        lock = threading.Lock()
+
+        def parse_and_transform_batch(fetched_data: str) -> tuple[str, list[str], list[Article]]:
+            if executor is not None:
+                pmids, transformed_articles = self.parse_pool.submit(executor, fetched_data).result()
+            else:
+                pmids, transformed_articles = parse_and_transform(self.parser, self.transformer, fetched_data)
+            return fetched_data, pmids, transformed_articles
+
+        def dedupe(parsed: tuple[str, list[str], list[Article]]) -> Optional[list[Article]]:
+            fetched_data, pmids, transformed_articles = parsed
+            if self.cache is not None and cache_results and pmids:
+                self.cache.put(pmids, fetched_data, topic=topic)
+            with lock:
+                transformed_articles = self._dedupe(transformed_articles, seen_pmids)
+            return transformed_articles or None
+
+        def load(transformed_articles: list[Article]) -> None:
+            stats = self.loader.load(transformed_articles)
+            with lock:
+                merge_stats(total_stats, stats)
+
+        pipeline = StagedPipeline(
+            [
+                Stage("parse", parse_and_transform_batch, self.stage_workers["parse"]),
+                Stage("dedupe", dedupe, 1),
+                Stage("load", load, self.stage_workers["load"])
+            ],
+            queue_size=self.queue_size
+        )
+
+        executor = self.parse_pool.executor() if self.parse_pool is not None else None
+        try:
+            pipeline.run(batches)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return total_stats
+
+    def _parse_batches(self, batches: Iterator[str]) -> Iterator[tuple[str, list[str], list[Article]]]:
+        if self.parse_pool is not None:
+            yield from self.parse_pool.map(batches)
+            return
+
+        for fetched_data in batches:
+            logger.info("Transforming data")
+            pmids, transformed_articles = parse_and_transform(self.parser, self.transformer, fetched_data)
+            yield fetched_data, pmids, transformed_articles
+
+    def _dedupe(self, articles: list[Article], seen_pmids: set) -> list[Article]:
+        unique_articles = []
+        for article in articles:
+            if article.pmid in seen_pmids:
+                continue
+            seen_pmids.add(article.pmid)
+            unique_articles.append(article)
+
+        if len(unique_articles) < len(articles):
+            logger.info(f"Dropped {len(articles) - len(unique_articles)} duplicate articles")
+        return unique_articles
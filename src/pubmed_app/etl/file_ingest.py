@@ -0,0 +1,102 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+from typing import Union
+
+from pubmed_app.config.logger import logger
+from pubmed_app.etl.parser import create_parser
+from pubmed_app.etl.transformer import ArticleTransformer
+from pubmed_app.etl.loader import DatabaseLoader, merge_stats
+from pubmed_app.etl.bulk_loader import BulkDatabaseLoader
+
+LOAD_CHUNK_SIZE = 1000
+UPDATE_DIRECTORY = "updatefiles"
+
+def ingest_file(path: Union[str, Path], chunk_size: int = LOAD_CHUNK_SIZE, bulk_load: bool = False, update: bool = False) -> dict:
+    path = Path(path)
+    parser = create_parser()
+    transformer = ArticleTransformer()
+    loader_class = BulkDatabaseLoader if bulk_load else DatabaseLoader
+    loader = loader_class(update=update)
+    if not bulk_load:
+        loader.warm_cache()
+
+    logger.info(f"Ingesting file: {path.name}")
+
+    stats = {}
+    deleted_pmids = []
+    articles = parser.iter_parse(path, deleted_pmids=deleted_pmids)
+    while True:
+        chunk = list(islice(articles, chunk_size))
+        if not chunk:
+            break
+
+        transformed_articles = transformer.transform(chunk)
+        if transformed_articles:
+            merge_stats(stats, loader.load(transformed_articles))
+
+    stats["articles_deleted"] = loader.delete_articles(deleted_pmids)
+    if stats.get("articles_failed"):
+        logger.warning(f"{stats['articles_failed']} articles failed in {path.name}, the file will be ingested again on the next run")
+    else:
+        loader.mark_file_ingested(path.name, stats.get("articles_inserted", 0), stats["articles_deleted"])
+
+    logger.info(f"Finished file {path.name}: {stats}")
+    return stats
+
+class FileIngestor:
+    def __init__(self, workers: int = 1, bulk_load: bool = False, update: bool = False):
+        self.workers = workers
+        self.bulk_load = bulk_load
+        self.update = update
+        self.loader = DatabaseLoader()
+
+    def run(self, directory: Union[str, Path], pattern: str = "*.xml.gz", resume: bool = True) -> dict:
+        directory = Path(directory)
+        files = sorted(directory.glob(pattern))
+        logger.info(f"Found {len(files)} files matching {pattern} in {directory}")
+
+        if resume:
+            done = self.loader.get_ingested_files()
+            files = [path for path in files if path.name not in done]
+            logger.info(f"{len(files)} files left to ingest after skipping completed files")
+
+        total_stats = {"files_processed": 0, "files_failed": 0}
+        if not files:
+            return total_stats
+
+        update = self.update or directory.name == UPDATE_DIRECTORY
+        if update:
+            if not self.update:
+                logger.info(f"{directory} holds update files, applying revisions to existing articles")
+            if self.workers > 1:
+                logger.warning("Update files revise and delete citations in file order, applying them one at a time")
+            for path in files:
+                if not self._record(total_stats, path, lambda: ingest_file(path, bulk_load=self.bulk_load, update=True)):
+                    logger.error(f"Stopping at {path.name} so later update files are not applied before it")
+                    break
+        elif self.workers <= 1:
+            for path in files:
+                self._record(total_stats, path, lambda: ingest_file(path, bulk_load=self.bulk_load))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                futures = {executor.submit(ingest_file, str(path), LOAD_CHUNK_SIZE, self.bulk_load): path for path in files}
+                for future in as_completed(futures):
+                    self._record(total_stats, futures[future], future.result)
+
+        logger.info(f"File ingest complete: {total_stats}")
+        return total_stats
+
+    def _record(self, total_stats: dict, path: Path, get_stats) -> bool:
+        try:
+            stats = get_stats()
+        except Exception as e:
+            logger.error(f"Failed to ingest file {path.name}: {e}")
+            total_stats["files_failed"] += 1
+            return False
+
+        total_stats["files_processed"] += 1
+        merge_stats(total_stats, stats)
+        return not stats.get("articles_failed")
@@ -1,126 +1,457 @@
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, fields
+from datetime import date
+
+from psycopg2.extras import execute_values
 
 from pubmed_app.config import logger
 from pubmed_app.database.connection import get_db_connection
-from pubmed_app.etl.transformer import Article, Author
+from pubmed_app.etl.transformer import Article
+from pubmed_app.etl.id_cache import LRUCache
 
 @dataclass
 class LoaderStats:
     articles_inserted: int = 0
+    articles_updated: int = 0
     articles_skipped: int = 0
     authors_inserted: int = 0
     journals_inserted: int = 0
     mesh_terms_inserted: int = 0
+    articles_failed: int = 0
+    journals_cache_hits: int = 0
+    journals_cache_misses: int = 0
+    authors_cache_hits: int = 0
+    authors_cache_misses: int = 0
+    mesh_terms_cache_hits: int = 0
+    mesh_terms_cache_misses: int = 0
+
+def merge_stats(total_stats: dict, stats: dict) -> None:
+    for key, value in stats.items():
+        if key == "cache_hit_ratio":
+            continue
+        total_stats[key] = total_stats.get(key, 0) + value
+
+    hits = sum(value for key, value in total_stats.items() if key.endswith("_cache_hits"))
+    misses = sum(value for key, value in total_stats.items() if key.endswith("_cache_misses"))
+    if hits + misses:
+        total_stats["cache_hit_ratio"] = round(hits / (hits + misses), 4)
 
 class DatabaseLoader:
-    def __init__(self):
-        pass
+    DIMENSION_TABLES = ("journals", "authors", "mesh_terms")
+
+    def __init__(self, cache_size: int = 50000, commit_size: int = 500, update: bool = False):
+        self.commit_size = commit_size
+        self.update = update
+        self.id_caches = {table: LRUCache(cache_size) for table in self.DIMENSION_TABLES}
+
+    def warm_cache(self) -> None:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT id, name FROM journals ORDER BY id DESC LIMIT %s", (self.id_caches["journals"].maxsize,))
+                for row in reversed(cursor.fetchall()):
+                    self.id_caches["journals"].put((row['name'],), row['id'])
+
+                cursor.execute("SELECT id, term FROM mesh_terms ORDER BY id DESC LIMIT %s", (self.id_caches["mesh_terms"].maxsize,))
+                for row in reversed(cursor.fetchall()):
+                    self.id_caches["mesh_terms"].put((row['term'],), row['id'])
+
+        logger.info(f"Warmed ID cache with {len(self.id_caches['journals'])} journals and {len(self.id_caches['mesh_terms'])} MeSH terms")
 
     def load(self, articles: list[Article]) -> LoaderStats:
         stats = LoaderStats()
         logger.info(f"Starting to load {len(articles)} articles into the database.")
 
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            with cursor:
-                for article in articles:
-                    try:
-                        inserted = self._load_article(cursor, article, stats)
-                        if inserted:
-                            stats.articles_inserted += 1
-                        else:
-                            stats.articles_skipped += 1
-                    except Exception as e:
-                        logger.error(f"Failed to load article PMID {article.pmid}: {e}")
-                        continue
-
-        logger.info(f"Loading complete: {stats.articles_inserted} articles inserted, {stats.articles_skipped} articles skipped")
-
-        return {
-            "articles_inserted": stats.articles_inserted,
-            "articles_skipped": stats.articles_skipped,
-            "authors_inserted": stats.authors_inserted,
-            "journals_inserted": stats.journals_inserted,
-            "mesh_terms_inserted": stats.mesh_terms_inserted
-        }
+        for start in range(0, len(articles), self.commit_size):
+            chunk = articles[start:start + self.commit_size]
+            chunk_stats = LoaderStats()
+            chunk_ids = {}
+            try:
+                with get_db_connection() as conn:
+                    with conn.cursor() as cursor:
+                        self._load_chunk(cursor, chunk, chunk_stats, chunk_ids)
+            except Exception as e:
+                logger.error(f"Failed to commit batch of {len(chunk)} articles: {e}")
+                stats.articles_failed += len(chunk)
+                continue
+
+            self._add_stats(stats, chunk_stats)
+            self._cache_ids(chunk_ids)
+
+        logger.info(f"Loading complete: {stats.articles_inserted} articles inserted, {stats.articles_updated} articles updated, {stats.articles_skipped} articles skipped, {stats.articles_failed} articles failed")
+
+        return self._stats_to_dict(stats)
+
+    def _load_chunk(self, cursor, articles: list[Article], stats: LoaderStats, new_ids: dict) -> None:
+        error = self._load_with_savepoint(cursor, articles, stats, new_ids)
+        if error is None:
+            return
+
+        logger.warning(f"Batch of {len(articles)} articles failed ({error}), retrying one by one")
+        for article in articles:
+            error = self._load_with_savepoint(cursor, [article], stats, new_ids)
+            if error is not None:
+                logger.error(f"Failed to load article PMID {article.pmid}: {error}")
+                stats.articles_failed += 1
+
+    def _load_with_savepoint(self, cursor, articles: list[Article], stats: LoaderStats, new_ids: dict) -> Optional[Exception]:
+        attempt_stats = LoaderStats()
+        attempt_ids = {}
+        cursor.execute("SAVEPOINT load_batch")
+        try:
+            self._load_batch(cursor, articles, attempt_stats, attempt_ids)
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT load_batch")
+            return e
+
+        cursor.execute("RELEASE SAVEPOINT load_batch")
+        self._add_stats(stats, attempt_stats)
+        for table, ids in attempt_ids.items():
+            new_ids.setdefault(table, {}).update(ids)
+        return None
+
+    def _add_stats(self, stats: LoaderStats, other: LoaderStats) -> None:
+        for field in fields(LoaderStats):
+            setattr(stats, field.name, getattr(stats, field.name) + getattr(other, field.name))
+
+    def _cache_ids(self, new_ids: dict) -> None:
+        for table, ids in new_ids.items():
+            cache = self.id_caches[table]
+            for key, row_id in ids.items():
+                cache.put(key, row_id)
+
+    def _stats_to_dict(self, stats: LoaderStats) -> dict:
+        result = asdict(stats)
+        merge_stats(result, {})
+        return result
     
-    def _load_article(self, cursor, article: Article, stats: LoaderStats) -> bool:
-        cursor.execute("SELECT id FROM articles WHERE pmid = %s", (article.pmid,))
-        if cursor.fetchone():
-            return False
-
-        journal_id = None
-        if article.journal:
-            cursor.execute("SELECT id FROM journals WHERE name = %s", (article.journal,))
-            journal_row = cursor.fetchone()
-            if journal_row:
-                journal_id = journal_row['id']
+    def get_watermark(self, topic: str) -> Optional[date]:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT last_synced_date FROM etl_sync_state WHERE topic = %s", (topic,))
+                row = cursor.fetchone()
+        return row['last_synced_date'] if row else None
+
+    def save_watermark(self, topic: str, synced_date: date, articles_found: int) -> None:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO etl_sync_state (topic, last_synced_date, articles_found)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (topic) DO UPDATE SET
+                        last_synced_date = EXCLUDED.last_synced_date,
+                        articles_found = EXCLUDED.articles_found,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (topic, synced_date, articles_found)
+                )
+        logger.info(f"Saved watermark {synced_date} for topic: {topic}")
+
+    def get_checkpoint(self, job_name: str) -> Optional[dict]:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT job_name, topic, retmax, batch_size, position, completed FROM etl_checkpoints WHERE job_name = %s",
+                    (job_name,)
+                )
+                row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def save_checkpoint(
+            self,
+            job_name: str,
+            topic: str,
+            retmax: int,
+            batch_size: int,
+            position: int,
+            completed: bool = False
+        ) -> None:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO etl_checkpoints (job_name, topic, retmax, batch_size, position, completed)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (job_name) DO UPDATE SET
+                        topic = EXCLUDED.topic,
+                        retmax = EXCLUDED.retmax,
+                        batch_size = EXCLUDED.batch_size,
+                        position = EXCLUDED.position,
+                        completed = EXCLUDED.completed,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (job_name, topic, retmax, batch_size, position, completed)
+                )
+        logger.debug(f"Checkpoint for job {job_name}: position {position}, completed={completed}")
+
+    def filter_missing_pmids(self, pmids: list[str]) -> list[str]:
+        if not pmids:
+            return []
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pmid FROM articles WHERE pmid = ANY(%s)", (pmids,))
+                existing = {row['pmid'] for row in cursor.fetchall()}
+        return [pmid for pmid in pmids if pmid not in existing]
+
+    def save_topic_members(self, topic: str, pmids: list[str]) -> int:
+        if not pmids:
+            return 0
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO article_topics (article_id, topic)
+                    SELECT id, %s FROM articles WHERE pmid = ANY(%s)
+                    ON CONFLICT DO NOTHING
+                    """,
+                    (topic, pmids)
+                )
+                added = cursor.rowcount
+        logger.info(f"Recorded {added} new articles for topic: {topic}")
+        return added
+
+    def delete_articles(self, pmids: list[str]) -> int:
+        if not pmids:
+            return 0
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM articles WHERE pmid = ANY(%s)", (pmids,))
+                deleted = cursor.rowcount
+        logger.info(f"Deleted {deleted} of {len(pmids)} citations")
+        return deleted
+
+    def get_ingested_files(self) -> set[str]:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT file_name FROM ingested_files")
+                rows = cursor.fetchall()
+        return {row['file_name'] for row in rows}
+
+    def mark_file_ingested(self, file_name: str, articles_inserted: int, articles_deleted: int) -> None:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO ingested_files (file_name, articles_inserted, articles_deleted)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (file_name) DO UPDATE SET
+                        articles_inserted = EXCLUDED.articles_inserted,
+                        articles_deleted = EXCLUDED.articles_deleted,
+                        completed_at = CURRENT_TIMESTAMP
+                    """,
+                    (file_name, articles_inserted, articles_deleted)
+                )
+
+    def _load_batch(self, cursor, articles: list[Article], stats: LoaderStats, new_ids: dict) -> None:
+        new_articles, changed_articles, existing_ids = self._partition_existing(cursor, articles)
+        written_articles = new_articles + changed_articles
+
+        journal_ids = self._upsert_dimension(
+            cursor, "journals", ("name",),
+            {(article.journal,) for article in written_articles if article.journal},
+            stats, "journals_inserted", new_ids
+        )
+        author_ids = self._upsert_dimension(
+            cursor, "authors", ("last_name", "first_name"),
+            {(author.last_name, author.fore_name) for article in written_articles for author in article.authors},
+            stats, "authors_inserted", new_ids
+        )
+        mesh_ids = self._upsert_dimension(
+            cursor, "mesh_terms", ("term",),
+            {(term,) for article in written_articles for term in article.mesh_terms},
+            stats, "mesh_terms_inserted", new_ids
+        )
+
+        article_ids = self._insert_articles(cursor, new_articles, journal_ids)
+        updated_ids = self._update_articles(cursor, changed_articles, existing_ids, journal_ids)
+        self._delete_links(cursor, list(updated_ids.values()))
+        self._insert_links(cursor, written_articles, {**article_ids, **updated_ids}, author_ids, mesh_ids)
+
+        stats.articles_inserted += len(article_ids)
+        stats.articles_updated += len(updated_ids)
+        stats.articles_skipped += len(articles) - len(article_ids) - len(updated_ids)
+
+    def _partition_existing(self, cursor, articles: list[Article]) -> tuple[list[Article], list[Article], dict[str, int]]:
+        unique_articles = {}
+        for article in articles:
+            unique_articles.setdefault(article.pmid, article)
+
+        if not unique_articles:
+            return [], [], {}
+
+        cursor.execute("SELECT id, pmid, content_hash FROM articles WHERE pmid = ANY(%s)", (list(unique_articles),))
+        existing = {row['pmid']: row for row in cursor.fetchall()}
+
+        new_articles = []
+        changed_articles = []
+        for pmid, article in unique_articles.items():
+            row = existing.get(pmid)
+            if row is None:
+                new_articles.append(article)
+            elif self.update and row['content_hash'] != article.content_hash():
+                changed_articles.append(article)
+
+        existing_ids = {pmid: row['id'] for pmid, row in existing.items()}
+        return new_articles, changed_articles, existing_ids
+
+    def _upsert_dimension(
+            self,
+            cursor,
+            table: str,
+            columns: tuple[str, ...],
+            values: set[tuple],
+            stats: LoaderStats,
+            stat_name: str,
+            new_ids: dict
+        ) -> dict[tuple, int]:
+        if not values:
+            return {}
+
+        cache = self.id_caches[table]
+        ids = {}
+        missing = set()
+        for value in values:
+            cached_id = cache.get(value)
+            if cached_id is None:
+                missing.add(value)
             else:
-                cursor.execute("INSERT INTO journals (name) VALUES (%s) RETURNING id", (article.journal,))
-                journal_id = cursor.fetchone()['id']
-                stats.journals_inserted += 1
+                ids[value] = cached_id
+
+        setattr(stats, f"{table}_cache_hits", getattr(stats, f"{table}_cache_hits") + len(ids))
+        setattr(stats, f"{table}_cache_misses", getattr(stats, f"{table}_cache_misses") + len(missing))
+
+        if not missing:
+            return ids
+
+        column_list = ", ".join(columns)
+        inserted_rows = execute_values(
+            cursor,
+            f"""
+            INSERT INTO {table} ({column_list}) VALUES %s
+            ON CONFLICT ({column_list}) DO NOTHING
+            RETURNING id, {column_list}
+            """,
+            sorted(missing, key=lambda value: tuple(v or "" for v in value)),
+            page_size=1000,
+            fetch=True
+        )
+        setattr(stats, stat_name, getattr(stats, stat_name) + len(inserted_rows))
+
+        rows = list(inserted_rows)
+        inserted_keys = {tuple(row[column] for column in columns) for row in inserted_rows}
+        existing = missing - inserted_keys
+        if existing:
+            match = " AND ".join(f"t.{column} = v.{column}" for column in columns)
+            rows += execute_values(
+                cursor,
+                f"SELECT t.id, {', '.join(f't.{column}' for column in columns)} FROM {table} t JOIN (VALUES %s) AS v ({column_list}) ON {match}",
+                list(existing),
+                page_size=1000,
+                fetch=True
+            )
+
+        table_ids = new_ids.setdefault(table, {})
+        for row in rows:
+            key = tuple(row[column] for column in columns)
+            ids[key] = row['id']
+            table_ids[key] = row['id']
+        return ids
+
+    def _insert_articles(self, cursor, articles: list[Article], journal_ids: dict[tuple, int]) -> dict[str, int]:
+        if not articles:
+            return {}
 
-        cursor.execute(
+        rows = execute_values(
+            cursor,
             """
-            INSERT INTO articles (pmid, title, abstract, publication_year, journal_id)
-            VALUES (%s, %s, %s, %s, %s) RETURNING id
+            INSERT INTO articles (pmid, title, abstract, publication_year, journal_id, content_hash) VALUES %s
+            ON CONFLICT (pmid) DO NOTHING
+            RETURNING id, pmid
             """,
-            (article.pmid, article.title, article.abstract, article.year, journal_id)
+            [
+                (article.pmid, article.title, article.abstract, article.year, journal_ids.get((article.journal,)), article.content_hash())
+                for article in articles
+            ],
+            page_size=1000,
+            fetch=True
         )
-        article_id = cursor.fetchone()['id']
+        return {row['pmid']: row['id'] for row in rows}
 
-        self._load_authors(cursor, article_id, article.authors, stats)
-        self._load_mesh_terms(cursor, article_id, article.mesh_terms, stats)
+    def _update_articles(
+            self,
+            cursor,
+            articles: list[Article],
+            existing_ids: dict[str, int],
+            journal_ids: dict[tuple, int]
+        ) -> dict[str, int]:
+        if not articles:
+            return {}
 
-        return True
-    
-    def _get_or_create_journal(self, cursor, journal_name: str, stats: LoaderStats) -> int:
-        cursor.execute("SELECT id FROM journals WHERE name = %s", (journal_name,))
-        row = cursor.fetchone()
-        if row:
-            return row['id']
-        
-        cursor.execute("INSERT INTO journals (name) VALUES (%s) RETURNING id", (journal_name,))
-        journal_id = cursor.fetchone()['id']
-        stats.journals_inserted += 1
-        return journal_id
-    
-    def _load_authors(self, cursor, article_id: int, authors: list[Author], stats: LoaderStats) -> None:
-        for position, author in enumerate(authors, start=1):
-            cursor.execute(
-                "SELECT id FROM authors WHERE last_name = %s AND first_name = %s",
-                (author.last_name, author.fore_name)
-            )
-            author_row = cursor.fetchone()
-            if author_row:
-                author_id = author_row['id']
-            else:
-                cursor.execute(
-                    "INSERT INTO authors (last_name, first_name) VALUES (%s, %s) RETURNING id",
-                    (author.last_name, author.fore_name)
-                )
-                author_id = cursor.fetchone()['id']
-                stats.authors_inserted += 1
+        rows = execute_values(
+            cursor,
+            """
+            UPDATE articles SET
+                title = v.title,
+                abstract = v.abstract,
+                publication_year = v.publication_year,
+                journal_id = v.journal_id,
+                content_hash = v.content_hash,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v (id, title, abstract, publication_year, journal_id, content_hash)
+            WHERE articles.id = v.id
+            RETURNING articles.id, articles.pmid
+            """,
+            [
+                (existing_ids[article.pmid], article.title, article.abstract, article.year, journal_ids.get((article.journal,)), article.content_hash())
+                for article in articles
+            ],
+            template="(%s::integer, %s::text, %s::text, %s::integer, %s::integer, %s::char(64))",
+            page_size=1000,
+            fetch=True
+        )
+        return {row['pmid']: row['id'] for row in rows}
 
-            cursor.execute(
-                "INSERT INTO article_authors (article_id, author_id, author_postion) VALUES (%s, %s, %s) ON CONFLICT DO NOTHING",
-                (article_id, author_id, position)
-            )
+    def _delete_links(self, cursor, article_ids: list[int]) -> None:
+        if not article_ids:
+            return
 
-    def _load_mesh_terms(self, cursor, article_id: int, mesh_terms: list[str], stats: LoaderStats) -> None:
-        for term in mesh_terms:
-            cursor.execute("SELECT id FROM mesh_terms WHERE term = %s", (term,))
-            mesh_row = cursor.fetchone()
-            if mesh_row:
-                mesh_id = mesh_row['id']
-            else:
-                cursor.execute("INSERT INTO mesh_terms (term) VALUES (%s) RETURNING id", (term,))
-                mesh_id = cursor.fetchone()['id']
-                stats.mesh_terms_inserted += 1
-
-            cursor.execute(
-                "INSERT INTO article_mesh_terms (article_id, mesh_term_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                (article_id, mesh_id)
-            )
\ No newline at end of file
+        cursor.execute("DELETE FROM article_authors WHERE article_id = ANY(%s)", (article_ids,))
+        cursor.execute("DELETE FROM article_mesh_terms WHERE article_id = ANY(%s)", (article_ids,))
+
+    def _insert_links(
+            self,
+            cursor,
+            articles: list[Article],
+            article_ids: dict[str, int],
+            author_ids: dict[tuple, int],
+            mesh_ids: dict[tuple, int]
+        ) -> None:
+        author_links = []
+        mesh_links = []
+        for article in articles:
+            article_id = article_ids.get(article.pmid)
+            if article_id is None:
+                continue
+
+            for position, author in enumerate(article.authors, start=1):
+                author_links.append((article_id, author_ids[(author.last_name, author.fore_name)], position))
+            for term in article.mesh_terms:
+                mesh_links.append((article_id, mesh_ids[(term,)]))
+
+        if author_links:
+            execute_values(
+                cursor,
+                "INSERT INTO article_authors (article_id, author_id, author_postion) VALUES %s ON CONFLICT DO NOTHING",
+                author_links,
+                page_size=1000
+            )
+        if mesh_links:
+            execute_values(
+                cursor,
+                "INSERT INTO article_mesh_terms (article_id, mesh_term_id) VALUES %s ON CONFLICT DO NOTHING",
+                mesh_links,
+                page_size=1000
+            )
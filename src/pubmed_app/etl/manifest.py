@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import yaml
+
+@dataclass
+class ManifestTopic:
+    name: str
+    term: str
+    max_results: int
+
+def load_manifest(path: Union[str, Path], default_max_results: int = 100) -> list[ManifestTopic]:
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    if isinstance(data, list):
+        data = {"topics": data}
+
+    defaults = data.get("defaults", {})
+    max_results = int(defaults.get("max_results", default_max_results))
+
+    topics = []
+    for entry in data.get("topics", []):
+        if isinstance(entry, str):
+            entry = {"term": entry}
+
+        term = entry.get("term") or entry.get("name")
+        if not term:
+            raise ValueError(f"Manifest topic is missing a term: {entry}")
+
+        topics.append(ManifestTopic(
+            name=entry.get("name", term),
+            term=term,
+            max_results=int(entry.get("max_results", max_results))
+        ))
+
+    if not topics:
+        raise ValueError(f"No topics found in manifest: {path}")
+    return topics
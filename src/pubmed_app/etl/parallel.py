@@ -0,0 +1,81 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterator
+
+from pubmed_app.config.logger import logger
+from pubmed_app.etl.parser import PubMedParser, create_parser
+from pubmed_app.etl.transformer import ArticleTransformer, Article
+
+_parser = None
+_transformer = None
+
+def parse_and_transform(
+        parser: PubMedParser,
+        transformer: ArticleTransformer,
+        xml_string: str
+    ) -> tuple[list[str], list[Article]]:
+    parsed_articles = parser.parse(xml_string)
+    pmids = [article["pmid"] for article in parsed_articles]
+    return pmids, transformer.transform(parsed_articles)
+
+def _init_worker(parser_backend: str) -> None:
+    global _parser, _transformer
+    _parser = create_parser(parser_backend)
+    _transformer = ArticleTransformer()
+
+def _run_worker(xml_string: str) -> tuple[list[str], list[Article]]:
+    return parse_and_transform(_parser, _transformer, xml_string)
+
+class ParseTransformPool:
+    def __init__(self, workers: int, parser_backend: str = "auto", ordered: bool = True):
+        self.workers = workers
+        self.parser_backend = parser_backend
+        self.ordered = ordered
+
+    def executor(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.parser_backend,)
+        )
+
+    def submit(self, executor: ProcessPoolExecutor, xml_string: str) -> Future:
+        return executor.submit(_run_worker, xml_string)
+
+    def map(self, batches: Iterator[str]) -> Iterator[tuple[str, list[str], list[Article]]]:
+        logger.info(f"Parsing batches with {self.workers} worker processes (ordered={self.ordered})")
+        max_pending = self.workers * 2
+
+        with self.executor() as executor:
+            pending = deque()
+            sources = {}
+
+            for xml_string in batches:
+                future = self.submit(executor, xml_string)
+                pending.append(future)
+                sources[future] = xml_string
+
+                if len(pending) >= max_pending:
+                    yield from self._drain(pending, sources, block_all=False)
+
+            yield from self._drain(pending, sources, block_all=True)
+
+    def _drain(self, pending: deque, sources: dict, block_all: bool):
+        while pending:
+            if self.ordered:
+                future = pending.popleft()
+                done = [future]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                pmids, articles = future.result()
+                yield sources.pop(future), pmids, articles
+
+            if not block_all:
+                return
@@ -0,0 +1,65 @@
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from pubmed_app.config.logger import logger
+from pubmed_app.etl.loader import DatabaseLoader, merge_stats
+from pubmed_app.etl.bulk_loader import BulkDatabaseLoader
+from pubmed_app.etl.transformer import Article
+
+_loader: Optional[DatabaseLoader] = None
+
+def partition_articles(articles: list[Article], partitions: int) -> list[list[Article]]:
+    parts = [[] for _ in range(partitions)]
+    for article in articles:
+        parts[zlib.crc32(article.pmid.encode("utf-8")) % partitions].append(article)
+    return parts
+
+def _init_worker(bulk_load: bool, cache_size: int, commit_size: int, update: bool) -> None:
+    global _loader
+    loader_class = BulkDatabaseLoader if bulk_load else DatabaseLoader
+    _loader = loader_class(cache_size=cache_size, commit_size=commit_size, update=update)
+
+def _load_partition(articles: list[Article]) -> dict:
+    return _loader.load(articles)
+
+class ParallelDatabaseLoader(DatabaseLoader):
+    def __init__(
+            self,
+            workers: int,
+            bulk_load: bool = False,
+            cache_size: int = 50000,
+            commit_size: int = 500,
+            update: bool = False
+        ):
+        super().__init__(cache_size=cache_size, commit_size=commit_size, update=update)
+        self.workers = workers
+        self.bulk_load = bulk_load
+        self.cache_size = cache_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def load(self, articles: list[Article]) -> dict:
+        partitions = [part for part in partition_articles(articles, self.workers) if part]
+        logger.info(f"Loading {len(articles)} articles across {len(partitions)} worker processes")
+
+        total_stats = {}
+        for stats in self._get_executor().map(_load_partition, partitions):
+            merge_stats(total_stats, stats)
+        return total_stats
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.bulk_load, self.cache_size, self.commit_size, self.update)
+            )
+        return self._executor
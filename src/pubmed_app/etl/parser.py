@@ -1,8 +1,18 @@
 from pubmed_app.config.logger import logger
+import gzip
+import io
 import xml.etree.ElementTree as ET
-from typing import Optional
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
 
 class PubMedParser:
+    PARSE_ERRORS = (ET.ParseError,)
+
     def parse(self, xml_string: str) -> list[dict]:
         
         if not xml_string.strip():
@@ -12,8 +22,8 @@ class PubMedParser:
         articles = []
 
         try:
-            root = ET.fromstring(xml_string)
-        except ET.ParseError as e:
+            root = self._fromstring(xml_string)
+        except self.PARSE_ERRORS as e:
             logger.error(f"Error parsing XML: {e}")
             return []
         
@@ -30,6 +40,58 @@ class PubMedParser:
         logger.info(f"Parsed {len(articles)} articles from XML.")
         return articles
     
+    def iter_parse(
+            self,
+            source: Union[str, Path, bytes, BinaryIO],
+            deleted_pmids: Optional[list] = None
+        ) -> Iterator[dict]:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        elif isinstance(source, (str, Path)) and str(source).endswith(".gz"):
+            source = gzip.open(source, "rb")
+
+        count = 0
+
+        try:
+            for element in self._iter_elements(source):
+                if element.tag == "PubmedArticle":
+                    try:
+                        article = self._parse_article(element)
+                        if article:
+                            count += 1
+                            yield article
+                    except Exception as e:
+                        pmid = self._get_text(element, ".//PMID", "Unknown")
+                        logger.error(f"Error parsing article element with PMID {pmid}: {e}")
+                elif element.tag == "DeleteCitation" and deleted_pmids is not None:
+                    deleted_pmids.extend(pmid.text.strip() for pmid in element.findall("PMID") if pmid.text)
+        except self.PARSE_ERRORS as e:
+            logger.error(f"Error parsing XML: {e}")
+        finally:
+            if isinstance(source, gzip.GzipFile):
+                source.close()
+
+        logger.info(f"Streamed {count} articles from XML.")
+
+    def _fromstring(self, xml_string: str):
+        return ET.fromstring(xml_string)
+
+    def _iter_elements(self, source) -> Iterator[ET.Element]:
+        depth = 0
+        root = None
+
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1:
+                yield element
+                root.clear()
+
     def _parse_article(self, element: ET.Element) -> Optional[dict]:
         citation = element.find("MedlineCitation")
         if citation is None:
@@ -128,4 +190,140 @@ class PubMedParser:
             if descriptor:
                 mesh_terms.append(descriptor)
 
-        return mesh_terms
\ No newline at end of file
+        return mesh_terms
+
+class LxmlPubMedParser(PubMedParser):
+    PARSE_ERRORS = (ET.ParseError, etree.XMLSyntaxError) if etree is not None else (ET.ParseError,)
+    STREAM_TAGS = ("PubmedArticle", "PubmedBookArticle", "DeleteCitation")
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is required for the lxml parser backend")
+
+        self._xml_parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+        self._citation = etree.XPath("MedlineCitation[1]")
+        self._article = etree.XPath("Article[1]")
+        self._pmid = etree.XPath("string(PMID[1])")
+        self._title = etree.XPath("ArticleTitle[1]")
+        self._abstract_texts = etree.XPath("Abstract[1]/AbstractText")
+        self._journal = etree.XPath("Journal[1]")
+        self._journal_title = etree.XPath("string(Title[1])")
+        self._journal_issn = etree.XPath("string(ISSN[1])")
+        self._year_paths = [
+            etree.XPath("string((Journal/JournalIssue/PubDate/Year)[1])"),
+            etree.XPath("string((ArticleDate/Year)[1])")
+        ]
+        self._medline_date = etree.XPath("string((Journal/JournalIssue/PubDate/MedlineDate)[1])")
+        self._authors = etree.XPath("AuthorList[1]/Author")
+        self._last_name = etree.XPath("string(LastName[1])")
+        self._fore_name = etree.XPath("string(ForeName[1])")
+        self._affiliation = etree.XPath("(AffiliationInfo/Affiliation)[1]")
+        self._descriptors = etree.XPath("MeshHeadingList[1]/MeshHeading/DescriptorName[1]/text()")
+
+    def _fromstring(self, xml_string: str):
+        return etree.fromstring(xml_string.encode("utf-8"), parser=self._xml_parser)
+
+    def _iter_elements(self, source) -> Iterator:
+        for _, element in etree.iterparse(
+                source,
+                events=("end",),
+                tag=self.STREAM_TAGS,
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=True
+            ):
+            yield element
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def _first_text(self, nodes: list, default: str = "") -> str:
+        if nodes and nodes[0].text:
+            return nodes[0].text.strip()
+        return default
+
+    def _parse_article(self, element) -> Optional[dict]:
+        citations = self._citation(element)
+        if not citations:
+            return None
+        citation = citations[0]
+
+        articles = self._article(citation)
+        if not articles:
+            return None
+        artical = articles[0]
+
+        return {
+            "pmid": self._pmid(citation).strip(),
+            "title": self._first_text(self._title(artical)),
+            "abstract": self._get_abstract(artical),
+            "journal": self._get_journal(artical),
+            "year": self._get_year(artical),
+            "authors": self._get_authors(artical),
+            "mesh_terms": self._get_mesh_terms(citation)
+        }
+
+    def _get_abstract(self, article) -> Optional[str]:
+        texts = []
+        for text_element in self._abstract_texts(article):
+            label = text_element.get("Label", "")
+            text = text_element.text or ""
+
+            if label:
+                texts.append(f"{label}: {text.strip()}")
+            else:
+                texts.append(text.strip())
+
+        return " ".join(texts) if texts else None
+
+    def _get_journal(self, article) -> dict:
+        journals = self._journal(article)
+        if not journals:
+            return super()._get_journal(article)
+
+        return {
+            "name": self._journal_title(journals[0]).strip(),
+            "issn": self._journal_issn(journals[0]).strip()
+        }
+
+    def _get_year(self, article) -> Optional[int]:
+        for path in self._year_paths:
+            year_text = path(article).strip()
+            if year_text and year_text.isdigit():
+                return int(year_text)
+
+        medline_date = self._medline_date(article).strip()
+        if medline_date:
+            year_part = medline_date.split(" ")[0]
+            if year_part.isdigit():
+                return int(year_part)
+        return None
+
+    def _get_authors(self, article) -> list[dict]:
+        authors = []
+        for author_element in self._authors(article):
+            author = {
+                "last_name": self._last_name(author_element).strip(),
+                "first_name": self._fore_name(author_element).strip(),
+                "affiliation": self._first_text(self._affiliation(author_element))
+            }
+
+            if author["last_name"]:
+                authors.append(author)
+
+        return authors
+
+    def _get_mesh_terms(self, citation) -> list[str]:
+        mesh_terms = []
+        for descriptor in self._descriptors(citation):
+            descriptor = descriptor.strip()
+            if descriptor:
+                mesh_terms.append(descriptor)
+        return mesh_terms
+
+def create_parser(backend: str = "auto") -> PubMedParser:
+    if backend == "lxml" or (backend == "auto" and etree is not None):
+        return LxmlPubMedParser()
+    if backend not in ("auto", "stdlib"):
+        raise ValueError(f"Unknown parser backend: {backend}")
+    return PubMedParser()
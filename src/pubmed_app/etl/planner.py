@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from pubmed_app.config.logger import logger
+from pubmed_app.etl.pubmend_client import PubMedClient
+
+@dataclass
+class FetchUnit:
+    mindate: date
+    maxdate: date
+    count: int
+
+class QueryPlanner:
+    ESEARCH_MAX_IDS = 10000
+    EARLIEST_DATE = date(1781, 1, 1)
+
+    def __init__(self, client: PubMedClient, max_ids: int = ESEARCH_MAX_IDS, datetype: str = "edat"):
+        self.client = client
+        self.max_ids = max_ids
+        self.datetype = datetype
+
+    def plan(self, term: str, mindate: date = None, maxdate: date = None, limit: Optional[int] = None) -> list[FetchUnit]:
+        units = []
+        planned = 0
+        windows = [(mindate or self.EARLIEST_DATE, maxdate or date.today())]
+
+        while windows and (limit is None or planned < limit):
+            start, end = windows.pop()
+            count = self.count(term, start, end)
+            if count == 0:
+                continue
+
+            if count <= self.max_ids or start == end:
+                if count > self.max_ids:
+                    logger.warning(f"{count} articles on {start} exceed the esearch limit, only {self.max_ids} will be fetched")
+                units.append(FetchUnit(mindate=start, maxdate=end, count=count))
+                planned += min(count, self.max_ids)
+                continue
+
+            middle = start + (end - start) // 2
+            windows.append((start, middle))
+            windows.append((middle + timedelta(days=1), end))
+
+        logger.info(f"Planned {len(units)} date windows covering {sum(unit.count for unit in units)} articles")
+        return units
+
+    def count(self, term: str, start: date, end: date) -> int:
+        search_results = self.client.search(
+            term=term,
+            retmax=0,
+            mindate=start.strftime(PubMedClient.DATE_FORMAT),
+            maxdate=end.strftime(PubMedClient.DATE_FORMAT),
+            datetype=self.datetype
+        )
+        count = int(search_results.get("esearchresult", {}).get("count", 0))
+        logger.debug(f"Window {start} - {end}: {count} articles")
+        return count
@@ -1,13 +1,68 @@
+import random
 import requests
+import threading
 import time
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from typing import Iterator, Optional
+
+from pubmed_app.config.logger import logger
+from pubmed_app.etl.rate_limiter import TokenBucket
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
 
 class PubMedClient:
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+    FETCH_BATCH_SIZE = 500
+    DATE_FORMAT = "%Y/%m/%d"
+    REQUESTS_PER_SECOND = 3
+    REQUESTS_PER_SECOND_WITH_KEY = 10
+    TIMEOUT = (5, 60)
+    MAX_RETRIES = 5
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 60.0
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
     
-    def __init__(self, email: str, api_key: Optional[str] = None):
+    def __init__(
+            self,
+            email: str,
+            api_key: Optional[str] = None,
+            base_url: Optional[str] = None,
+            pool_size: int = 10
+        ):
         self.email = email
         self.api_key = api_key
+        self.base_url = base_url or self.BASE_URL
+        rate = self.REQUESTS_PER_SECOND_WITH_KEY if api_key else self.REQUESTS_PER_SECOND
+        self.rate_limiter = TokenBucket(rate=rate)
+        self.session = self._create_session(pool_size)
+        self.stats = ClientStats()
+        self._stats_lock = threading.Lock()
+
+    def _create_session(self, pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = asdict(self.stats)
+        stats["avg_latency"] = stats["total_latency"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
 
     def _get_params(self, additional_params: dict) -> dict:
         params = {"email": self.email}
@@ -16,26 +71,193 @@ class PubMedClient:
         params.update(additional_params)
         return params
 
-    def search(self, term: str, retmax: int = 20) -> dict:
-        url = f"{self.BASE_URL}esearch.fcgi"
+    def _get(self, url: str, params: dict) -> requests.Response:
+        return self._request("GET", url, params)
+
+    def _post(self, url: str, params: dict) -> requests.Response:
+        return self._request("POST", url, params)
+
+    def _request(self, method: str, url: str, params: dict) -> requests.Response:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            start = time.monotonic()
+            try:
+                if method == "POST":
+                    response = self.session.post(url, data=params, timeout=self.TIMEOUT)
+                else:
+                    response = self.session.get(url, params=params, timeout=self.TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response = None
+                error = e
+            latency = time.monotonic() - start
+            self._record_request(latency)
+
+            if response is not None and response.status_code not in self.RETRY_STATUS_CODES:
+                logger.debug(f"{method} {url} returned {response.status_code} in {latency:.3f}s")
+                response.raise_for_status()
+                return response
+
+            if attempt >= self.MAX_RETRIES:
+                with self._stats_lock:
+                    self.stats.failures += 1
+                if response is not None:
+                    response.raise_for_status()
+                raise error
+
+            delay = self._get_retry_delay(attempt, response)
+            reason = response.status_code if response is not None else error
+            logger.warning(f"Request to {url} failed ({reason}), retrying in {delay:.1f}s (attempt {attempt + 1}/{self.MAX_RETRIES})")
+            with self._stats_lock:
+                self.stats.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def _record_request(self, latency: float) -> None:
+        with self._stats_lock:
+            self.stats.requests += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+
+    def _get_retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None:
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.BACKOFF_MAX)
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt))
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def search(
+            self,
+            term: str,
+            retmax: int = 20,
+            usehistory: bool = False,
+            mindate: Optional[str] = None,
+            maxdate: Optional[str] = None,
+            datetype: str = "edat"
+        ) -> dict:
+        url = f"{self.base_url}esearch.fcgi"
         params = self._get_params({
             "db": "pubmed",
             "term": term,
             "retmax": retmax,
             "retmode": "json"
         })
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        if usehistory:
+            params["usehistory"] = "y"
+        if mindate or maxdate:
+            params.update({
+                "datetype": datetype,
+                "mindate": mindate or "1800/01/01",
+                "maxdate": maxdate or "3000"
+            })
+        return self._get(url, params).json()
 
     def fetch(self, id_list: list) -> dict:
-        url = f"{self.BASE_URL}efetch.fcgi"
+        url = f"{self.base_url}efetch.fcgi"
         ids = ",".join(id_list)
         params = self._get_params({
             "db": "pubmed",
             "id": ids,
             "retmode": "xml"
         })
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.text
\ No newline at end of file
+        return self._post(url, params).text
+
+    def fetch_history(
+            self,
+            webenv: str,
+            query_key: str,
+            count: int,
+            batch_size: int = FETCH_BATCH_SIZE,
+            max_workers: int = 1,
+            start: int = 0,
+            ordered: bool = False
+        ) -> Iterator[str]:
+        url = f"{self.base_url}efetch.fcgi"
+        batch_params = (
+            self._get_params({
+                "db": "pubmed",
+                "WebEnv": webenv,
+                "query_key": query_key,
+                "retstart": retstart,
+                "retmax": min(batch_size, count - retstart),
+                "retmode": "xml"
+            })
+            for retstart in range(start, count, batch_size)
+        )
+
+        if max_workers <= 1:
+            for params in batch_params:
+                yield self._get(url, params).text
+            return
+
+        yield from self._fetch_concurrent(url, batch_params, max_workers, ordered)
+
+    def fetch_ids(
+            self,
+            id_batches: Iterator[list[str]],
+            max_workers: int = 1,
+            ordered: bool = False
+        ) -> Iterator[str]:
+        url = f"{self.base_url}efetch.fcgi"
+        batch_params = (
+            self._get_params({
+                "db": "pubmed",
+                "id": ",".join(id_list),
+                "retmode": "xml"
+            })
+            for id_list in id_batches
+        )
+
+        if max_workers <= 1:
+            for params in batch_params:
+                yield self._post(url, params).text
+            return
+
+        yield from self._fetch_concurrent(url, batch_params, max_workers, ordered, method="POST")
+
+    def _fetch_concurrent(
+            self,
+            url: str,
+            batch_params: Iterator[dict],
+            max_workers: int,
+            ordered: bool = False,
+            method: str = "GET"
+        ) -> Iterator[str]:
+        logger.info(f"Fetching batches with {max_workers} concurrent workers")
+
+        if ordered:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque(
+                    executor.submit(self._request, method, url, params)
+                    for params in islice(batch_params, max_workers * 2)
+                )
+                while pending:
+                    future = pending.popleft()
+                    for params in islice(batch_params, 1):
+                        pending.append(executor.submit(self._request, method, url, params))
+                    yield future.result().text
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(self._request, method, url, params)
+                for params in islice(batch_params, max_workers * 2)
+            }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for params in islice(batch_params, 1):
+                        pending.add(executor.submit(self._request, method, url, params))
+                    yield future.result().text
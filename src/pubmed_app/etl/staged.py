@@ -0,0 +1,110 @@
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from pubmed_app.config.logger import logger
+
+_SENTINEL = object()
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[Any], Optional[Any]]
+    workers: int = 1
+
+class StagedPipeline:
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, stages: list[Stage], queue_size: int = 4):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+
+    def run(self, source: Iterable) -> None:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [
+            threading.Thread(target=self._produce, args=(source, queues[0], self.stages[0].workers), name="stage-source")
+        ]
+
+        for index, stage in enumerate(self.stages):
+            output_queue = queues[index + 1] if index + 1 < len(self.stages) else None
+            next_workers = self.stages[index + 1].workers if output_queue is not None else 0
+            active = {"count": stage.workers, "lock": threading.Lock()}
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], output_queue, next_workers, active),
+                    name=f"stage-{stage.name}-{worker}"
+                ))
+
+        logger.info(f"Starting staged pipeline: {', '.join(f'{stage.name} x{stage.workers}' for stage in self.stages)}")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def _produce(self, source: Iterable, output_queue: queue.Queue, consumers: int) -> None:
+        try:
+            for item in source:
+                if not self._put(output_queue, item):
+                    break
+        except BaseException as e:
+            self._fail("source", e)
+        finally:
+            if hasattr(source, "close"):
+                source.close()
+            for _ in range(consumers):
+                self._put(output_queue, _SENTINEL, force=True)
+
+    def _work(
+            self,
+            stage: Stage,
+            input_queue: queue.Queue,
+            output_queue: Optional[queue.Queue],
+            next_workers: int,
+            active: dict
+        ) -> None:
+        while True:
+            item = input_queue.get()
+            if item is _SENTINEL:
+                break
+            if self._stop.is_set():
+                continue
+
+            try:
+                result = stage.func(item)
+            except BaseException as e:
+                self._fail(stage.name, e)
+                continue
+
+            if output_queue is not None and result is not None:
+                self._put(output_queue, result)
+
+        with active["lock"]:
+            active["count"] -= 1
+            last_worker = active["count"] == 0
+        if last_worker and output_queue is not None:
+            for _ in range(next_workers):
+                self._put(output_queue, _SENTINEL, force=True)
+
+    def _put(self, target: queue.Queue, item: Any, force: bool = False) -> bool:
+        while force or not self._stop.is_set():
+            try:
+                target.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fail(self, stage_name: str, error: BaseException) -> None:
+        with self._error_lock:
+            if self._error is None:
+                logger.error(f"Stage '{stage_name}' failed, shutting down pipeline: {error}")
+                self._error = error
+        self._stop.set()
@@ -1,6 +1,8 @@
 from pubmed_app.config.logger import logger
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import Optional
+import hashlib
+import json
 import re
 import html
 
@@ -20,6 +22,10 @@ class Article:
     authors: list[Author] = field(default_factory=list)
     mesh_terms: list[str] = field(default_factory=list)
 
+    def content_hash(self) -> str:
+        payload = json.dumps(asdict(self), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 class ArticleTransformer:
     def transform(self, parsed_articles: list[dict]) -> list[Article]:
         articles = []
@@ -5,14 +5,17 @@ from typing import Union
 from io import StringIO, BytesIO
 
 from pubmed_app.config import logger
-from pubmed_app.database import Article
+from pubmed_app.database import Article, ArticleCRUD
 
 
 class ExportService:
+    def __init__(self):
+        self.article_crud = ArticleCRUD()
     
     def to_csv(self, articles: list[Article], filepath: Union[str, Path, None] = None) -> Union[Path, str]:
 
         logger.info(f"Exporting {len(articles)} articles to CSV")
+        articles = self._hydrate(articles)
         
         rows = []
         for article in articles:
@@ -22,7 +25,7 @@ class ExportService:
                 "abstract": article.abstract or "",
                 "journal": article.journal_name or "",
                 "year": article.publication_year or "",
-                "authors": article.authors_str if article.authors else "",
+                "authors": article.author_names if article.authors else "",
                 "mesh_terms": "; ".join(article.mesh_terms) if article.mesh_terms else "",
             })
         
@@ -48,6 +51,7 @@ class ExportService:
     
     def to_json(self, articles: list[Article], filepath: Union[str, Path, None] = None) -> Union[Path, str]:
         logger.info(f"Exporting {len(articles)} articles to JSON")
+        articles = self._hydrate(articles)
         
         data = []
         for article in articles:
@@ -79,3 +83,11 @@ class ExportService:
             return filepath
         else:
             return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def _hydrate(self, articles: list[Article]) -> list[Article]:
+        missing = [article.pmid for article in articles if not article.authors and not article.mesh_terms]
+        if not missing:
+            return articles
+
+        hydrated = {article.pmid: article for article in self.article_crud.get_by_pmids(missing)}
+        return [hydrated.get(article.pmid, article) for article in articles]
@@ -6,7 +6,7 @@ from pubmed_app.database import execute_query
 
 DB_SCHEMA = """
     TABLES:
-    - articles (id, pmid, title, abstract, publication_year, journal_id)
+    - articles (id, pmid, title, abstract, publication_year, journal_id, search_vector)
     - authors (id, last_name, fore_name, initials)
     - journals (id, name)
     - mesh_terms (id, term)
@@ -57,8 +57,8 @@ class LLMService:
                     3. Always use ILIKE for text searches (case-insensitive)
                     4. Limit results to 100 unless specified
                     5. Only SELECT queries are allowed (no INSERT, UPDATE, DELETE)
-                    6. For full-text search on title/abstract, use: 
-                       to_tsvector('english', title) @@ plainto_tsquery('english', 'search terms')
+                    6. For full-text search on title/abstract, use the indexed search_vector column:
+                       search_vector @@ websearch_to_tsquery('english', 'search terms')
 
                     Examples:
                     Q: How many articles are there?
@@ -67,7 +67,7 @@ class LLMService:
                     Q: Find articles about cancer from 2023
                     A: SELECT a.pmid, a.title, a.publication_year 
                        FROM articles a 
-                       WHERE to_tsvector('english', a.title || ' ' || COALESCE(a.abstract, '')) @@ plainto_tsquery('english', 'cancer')
+                       WHERE a.search_vector @@ websearch_to_tsquery('english', 'cancer')
                        AND a.publication_year = 2023
                        LIMIT 100;
 
@@ -2,6 +2,7 @@ from typing import Optional
 
 from pubmed_app.config.logger import logger
 from pubmed_app.database.curd import ArticleCRUD, Article
+from pubmed_app.database.models import ArticlePage
 
 class SearchService:
     def __init__(self):
@@ -16,13 +17,49 @@ class SearchService:
             journal: Optional[str] = None,
             author_name: Optional[str] = None,
             mesh_term: Optional[str] = None,
+            topic: Optional[str] = None,
+            ranked: bool = False,
+            snippets: bool = False,
             limit: int = 10,
-            offset: int = 0
+            offset: int = 0,
+            cursor: Optional[str] = None
         ) -> list[Article]:
+        return self.search_page(
+            keyword=keyword,
+            year=year,
+            year_from=year_from,
+            year_to=year_to,
+            journal=journal,
+            author_name=author_name,
+            mesh_term=mesh_term,
+            topic=topic,
+            ranked=ranked,
+            snippets=snippets,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        ).articles
+
+    def search_page(
+            self,
+            keyword: Optional[str] = None,
+            year: Optional[int] = None,
+            year_from: Optional[int] = None,
+            year_to: Optional[int] = None,
+            journal: Optional[str] = None,
+            author_name: Optional[str] = None,
+            mesh_term: Optional[str] = None,
+            topic: Optional[str] = None,
+            ranked: bool = False,
+            snippets: bool = False,
+            limit: int = 10,
+            offset: int = 0,
+            cursor: Optional[str] = None
+        ) -> ArticlePage:
 
-        logger.info(f"Searching articles with keyword={keyword}, year={year}, year_from={year_from}, year_to={year_to}, journal={journal}, author_name={author_name}, mesh_term={mesh_term}, limit={limit}, offset={offset}")
+        logger.info(f"Searching articles with keyword={keyword}, year={year}, year_from={year_from}, year_to={year_to}, journal={journal}, author_name={author_name}, mesh_term={mesh_term}, topic={topic}, ranked={ranked}, limit={limit}, offset={offset}, cursor={cursor}")
 
-        articles = self.article_crud.search(
+        page = self.article_crud.search_page(
             keyword=keyword,
             year=year,
             year_from=year_from,
@@ -30,19 +67,24 @@ class SearchService:
             journal=journal,
             author_name=author_name,
             mesh_term=mesh_term,
+            topic=topic,
+            ranked=ranked,
+            snippets=snippets,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
 
-        logger.info(f"Found {len(articles)} articles matching the search criteria")
+        logger.info(f"Found {len(page.articles)} articles matching the search criteria")
 
-        return articles
+        return page
     
     def get_filter_options(self) -> dict:
         return {
             "years": self.article_crud.get_years(),
             "journals": self.article_crud.get_journals(),
-            "mesh_terms": [item["term"] for item in self.article_crud.get_top_mesh_terms(30)]
+            "mesh_terms": [item["term"] for item in self.article_crud.get_top_mesh_terms(30)],
+            "topics": self.article_crud.get_topics()
         }
     
     def get_stats(self) -> dict:
@@ -0,0 +1,15 @@
+import os
+
+for name, value in {
+    "PUBMED_EMAIL": "test@example.com",
+    "PUBMED_API_KEY": "",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "pubmed_test",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "",
+    "BASE_URL": "",
+    "LLM_MODEL_NAME": "",
+    "API_KEY": "",
+}.items():
+    os.environ.setdefault(name, value)
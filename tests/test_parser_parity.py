@@ -0,0 +1,49 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("lxml")
+
+from pubmed_app.etl.parser import PubMedParser, LxmlPubMedParser
+
+FIXTURE = Path(__file__).parent / "fixtures" / "pubmed_sample.xml"
+
+@pytest.fixture
+def parsers():
+    return PubMedParser(), LxmlPubMedParser()
+
+def test_parse_parity(parsers):
+    xml_string = FIXTURE.read_text(encoding="utf-8")
+    stdlib, lxml = (parser.parse(xml_string) for parser in parsers)
+
+    assert stdlib == lxml
+    assert [article["pmid"] for article in stdlib] == ["10000001", "10000002"]
+
+def test_parse_edge_cases(parsers):
+    articles = parsers[1].parse(FIXTURE.read_text(encoding="utf-8"))
+    first, second = articles
+
+    assert first["year"] == 2019
+    assert first["title"].startswith("Effects of")
+    assert [author["last_name"] for author in first["authors"]] == ["Smith", "Doe"]
+    assert first["mesh_terms"] == ["Escherichia coli", "Water"]
+    assert second["journal"]["name"] == ""
+    assert second["year"] == 2021
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_iter_parse_parity(parsers, tmp_path, compressed):
+    source = FIXTURE
+    if compressed:
+        source = tmp_path / "pubmed_sample.xml.gz"
+        source.write_bytes(gzip.compress(FIXTURE.read_bytes()))
+
+    results = []
+    for parser in parsers:
+        deleted_pmids = []
+        articles = list(parser.iter_parse(source, deleted_pmids=deleted_pmids))
+        results.append((articles, deleted_pmids))
+
+    assert results[0] == results[1]
+    assert results[0][1] == ["10000003", "10000004"]
+    assert results[0][0] == parsers[0].parse(FIXTURE.read_text(encoding="utf-8"))
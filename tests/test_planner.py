@@ -0,0 +1,56 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from pubmed_app.etl.planner import QueryPlanner
+
+START = date(2024, 1, 1)
+END = date(2024, 1, 31)
+
+class CountingClient:
+    def __init__(self, daily_counts: dict):
+        self.daily_counts = daily_counts
+        self.calls = 0
+
+    def search(self, term, retmax, mindate, maxdate, datetype):
+        self.calls += 1
+        start = datetime.strptime(mindate, "%Y/%m/%d").date()
+        end = datetime.strptime(maxdate, "%Y/%m/%d").date()
+        count = sum(count for day, count in self.daily_counts.items() if start <= day <= end)
+        return {"esearchresult": {"count": str(count)}}
+
+def days(start: date, end: date):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+@pytest.fixture
+def client():
+    return CountingClient({day: 3 for day in days(START, END)})
+
+def test_plan_splits_windows_at_cap(client):
+    units = QueryPlanner(client, max_ids=10).plan("term", mindate=START, maxdate=END)
+
+    assert all(unit.count <= 10 for unit in units)
+    assert sum(unit.count for unit in units) == 3 * 31
+    assert units[0].maxdate == END
+    assert units[-1].mindate == START
+    for newer, older in zip(units, units[1:]):
+        assert older.maxdate + timedelta(days=1) == newer.mindate
+
+def test_plan_keeps_single_day_over_cap():
+    client = CountingClient({START: 25})
+
+    units = QueryPlanner(client, max_ids=10).plan("term", mindate=START, maxdate=START + timedelta(days=3))
+
+    assert [(unit.mindate, unit.maxdate, unit.count) for unit in units] == [(START, START, 25)]
+
+def test_plan_stops_at_limit(client):
+    full_plan = QueryPlanner(client, max_ids=10).plan("term", mindate=START, maxdate=END)
+    full_calls = client.calls
+    client.calls = 0
+
+    units = QueryPlanner(client, max_ids=10).plan("term", mindate=START, maxdate=END, limit=15)
+
+    assert sum(unit.count for unit in units) >= 15
+    assert sum(unit.count for unit in units[:-1]) < 15
+    assert units == full_plan[:len(units)]
+    assert client.calls < full_calls
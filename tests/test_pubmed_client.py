@@ -0,0 +1,98 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pubmed_app.etl.pubmend_client import PubMedClient
+from pubmed_app.etl.rate_limiter import TokenBucket
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._respond(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        self._respond(parse_qs(body))
+
+    def _respond(self, params: dict):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, time.monotonic()))
+            failure = server.failures.pop(0) if server.failures else None
+
+        if failure is not None:
+            self.send_response(failure)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if "id" in params:
+            body = f"<ids>{params['id'][0]}</ids>"
+        else:
+            body = f"<retstart>{params['retstart'][0]}</retstart>"
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.failures = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(stub_server):
+    client = PubMedClient(email="test@example.com", base_url=f"http://127.0.0.1:{stub_server.server_port}/")
+    client.rate_limiter = TokenBucket(rate=1000)
+    return client
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_fetch_ids_concurrent_returns_all_batches(client, stub_server, ordered):
+    batches = [[str(pmid) for pmid in range(start, start + 3)] for start in range(0, 30, 3)]
+
+    results = list(client.fetch_ids(iter(batches), max_workers=4, ordered=ordered))
+
+    expected = [f"<ids>{','.join(batch)}</ids>" for batch in batches]
+    assert (results if ordered else sorted(results)) == (expected if ordered else sorted(expected))
+    assert {method for method, _ in stub_server.requests} == {"POST"}
+
+def test_fetch_history_concurrent_returns_all_batches(client, stub_server):
+    results = list(client.fetch_history(webenv="env", query_key="1", count=95, batch_size=10, max_workers=4, ordered=True))
+
+    assert results == [f"<retstart>{retstart}</retstart>" for retstart in range(0, 95, 10)]
+    assert {method for method, _ in stub_server.requests} == {"GET"}
+
+def test_token_bucket_caps_request_rate(client, stub_server):
+    client.rate_limiter = TokenBucket(rate=20)
+
+    list(client.fetch_history(webenv="env", query_key="1", count=11, batch_size=1, max_workers=4))
+
+    times = sorted(timestamp for _, timestamp in stub_server.requests)
+    assert len(times) == 11
+    assert times[-1] - times[0] >= 10 / 20 * 0.9
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_after_retry_after_response(client, stub_server, status):
+    stub_server.failures = [status, status]
+
+    assert list(client.fetch_ids(iter([["1", "2"]]))) == ["<ids>1,2</ids>"]
+
+    stats = client.get_stats()
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
@@ -0,0 +1,41 @@
+import base64
+import json
+
+import pytest
+
+from pubmed_app.database.curd import ArticleCRUD
+
+@pytest.fixture
+def crud():
+    return ArticleCRUD()
+
+def encode(position) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+@pytest.mark.parametrize("position", [
+    {"offset": 0},
+    {"offset": 500},
+    {"key": [2021, 42], "direction": "next"},
+    {"key": [0, 7], "direction": "previous"},
+])
+def test_cursor_round_trip(crud, position):
+    assert crud._decode_cursor(crud._encode_cursor(position)) == position
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    base64.urlsafe_b64encode(b"not json").decode("ascii"),
+    encode([1, 2]),
+    encode({}),
+    encode({"offset": -1}),
+    encode({"offset": "10"}),
+    encode({"offset": True}),
+    encode({"key": [2021], "direction": "next"}),
+    encode({"key": [2021, 42]}),
+    encode({"key": [2021, 42], "direction": "sideways"}),
+    encode({"key": ["x", {}], "direction": "next"}),
+    encode({"key": [2021, 4.2], "direction": "next"}),
+    encode({"key": [True, 42], "direction": "next"}),
+])
+def test_malformed_cursor_rejected(crud, cursor):
+    with pytest.raises(ValueError, match="Invalid search cursor"):
+        crud._decode_cursor(cursor)